@@ -0,0 +1,161 @@
+#!/usr/bin/python
+"""
+Filename: bitboard.py
+Authors: Yoshi Fu
+Project: 2048 Game
+Date: October 2022
+
+Summary:
+This module implements the compiled bitboard kernels for the 2048 game.
+
+The board is a 64-bit integer made of 16 nibbles in row-major order, where
+each nibble holds log2 of the tile value (0 for an empty tile). Row r is
+stored in bits 16 * r up to 16 * (r + 1) and column c is nibble c of a row.
+"""
+
+import numpy as np
+from numba import boolean, njit, types, uint16, uint32, uint64
+
+EMPTY_BOARD = 0
+ROWS = 4
+ROW_COUNT = 1 << 16
+MAX_EXPONENT = 15
+
+ROW_MASK = np.uint64(0xFFFF)
+LOW_BITS = np.uint64(0x1111111111111111)
+# Lowest bit of every tile that has a neighbour to its right or below it.
+HORIZONTAL_PAIRS = np.uint64(0x0111011101110111)
+VERTICAL_PAIRS = np.uint64(0x0000111111111111)
+
+
+@njit(uint64(uint64), cache=True)
+def reverse_row(row):
+    """Reverse the order of the four nibbles in a 16-bit row."""
+    return (
+        ((row & np.uint64(0xF)) << np.uint64(12))
+        | ((row & np.uint64(0xF0)) << np.uint64(4))
+        | ((row >> np.uint64(4)) & np.uint64(0xF0))
+        | ((row >> np.uint64(12)) & np.uint64(0xF))
+    )
+
+
+@njit(types.Tuple((uint16[::1], uint32[::1]))(), cache=True)
+def build_move_table():
+    """Slide and merge every possible 16-bit row to the left. Returns the
+    resulting rows and the score gained by merging tiles in each row."""
+    moves = np.empty(ROW_COUNT, dtype=np.uint16)
+    scores = np.empty(ROW_COUNT, dtype=np.uint32)
+    exponents = np.empty(4, dtype=np.int64)
+
+    for row in range(ROW_COUNT):
+        # Collect the non-empty tiles of the row.
+        n = 0
+        for i in range(4):
+            e = (row >> (4 * i)) & 0xF
+            if e:
+                exponents[n] = e
+                n += 1
+
+        new_row = 0
+        score = 0
+        lane = 0
+        i = 0
+        while i < n:
+            e = exponents[i]
+            if i + 1 < n and exponents[i + 1] == e and e < MAX_EXPONENT:
+                e += 1
+                score += 1 << e
+                i += 2
+            else:
+                i += 1
+            new_row |= e << (4 * lane)
+            lane += 1
+
+        moves[row] = new_row
+        scores[row] = score
+    return moves, scores
+
+
+@njit(uint64(uint64, uint16[::1]), cache=True)
+def move_left_u64(state, moves):
+    """Move all tiles of the board to the left."""
+    new_state = np.uint64(0)
+    for i in range(ROWS):
+        shift = np.uint64(16 * i)
+        row = (state >> shift) & ROW_MASK
+        new_state |= np.uint64(moves[row]) << shift
+    return new_state
+
+
+@njit(uint64(uint64, uint16[::1]), cache=True)
+def move_right_u64(state, moves):
+    """Move all tiles of the board to the right."""
+    new_state = np.uint64(0)
+    for i in range(ROWS):
+        shift = np.uint64(16 * i)
+        row = reverse_row((state >> shift) & ROW_MASK)
+        new_state |= reverse_row(np.uint64(moves[row])) << shift
+    return new_state
+
+
+@njit(uint64(uint64, uint32[::1]), cache=True)
+def score_left_u64(state, scores):
+    """Score gained by moving all tiles of the board to the left."""
+    score = np.uint64(0)
+    for i in range(ROWS):
+        row = (state >> np.uint64(16 * i)) & ROW_MASK
+        score += np.uint64(scores[row])
+    return score
+
+
+@njit(uint64(uint64, uint32[::1]), cache=True)
+def score_right_u64(state, scores):
+    """Score gained by moving all tiles of the board to the right."""
+    score = np.uint64(0)
+    for i in range(ROWS):
+        row = reverse_row((state >> np.uint64(16 * i)) & ROW_MASK)
+        score += np.uint64(scores[row])
+    return score
+
+
+@njit(uint64(uint64), cache=True)
+def transpose_u64(state):
+    """Transpose the board by swapping nibbles across the diagonal."""
+    t = (state ^ (state >> np.uint64(12))) & np.uint64(0x0000F0F00000F0F0)
+    state ^= t ^ (t << np.uint64(12))
+    t = (state ^ (state >> np.uint64(24))) & np.uint64(0x00000000FF00FF00)
+    state ^= t ^ (t << np.uint64(24))
+    return state
+
+
+@njit(uint64(uint64), cache=True)
+def empty_mask(state):
+    """Get a mask with the lowest bit of every empty nibble set."""
+    x = state | (state >> np.uint64(1))
+    x |= x >> np.uint64(2)
+    return ~x & LOW_BITS
+
+
+@njit(uint64(uint64), cache=True)
+def full_mask(state):
+    """Get a mask with the lowest bit of every nibble set to 15 set."""
+    x = state & (state >> np.uint64(1))
+    x &= x >> np.uint64(2)
+    return x & LOW_BITS
+
+
+@njit(boolean(uint64), cache=True)
+def has_merge(state):
+    """Check if any two neighbouring tiles on the board can merge.
+
+    XOR-ing the board with itself shifted by one column (or one row) gives a
+    zero nibble wherever a tile equals its right (or lower) neighbour. Tiles
+    that are empty or already hold the largest value cannot merge.
+    """
+    mergeable = ~empty_mask(state) & ~full_mask(state) & LOW_BITS
+    horizontal = empty_mask(state ^ (state >> np.uint64(4))) & HORIZONTAL_PAIRS
+    vertical = empty_mask(state ^ (state >> np.uint64(16))) & VERTICAL_PAIRS
+    return ((horizontal | vertical) & mergeable) != 0
+
+
+MOVE_LEFT, SCORE_LEFT = build_move_table()
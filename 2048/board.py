@@ -10,17 +10,35 @@ This module implements a Board class for the 2048 game.
 """
 
 
+import random
+
 import numpy as np
 import pygame as pg
 
+from bitboard import (
+    EMPTY_BOARD,
+    MOVE_LEFT,
+    SCORE_LEFT,
+    empty_mask,
+    has_merge,
+    move_left_u64,
+    move_right_u64,
+    score_left_u64,
+    score_right_u64,
+    transpose_u64,
+)
 from label import Label
 from settings import Settings
 from tile import Tile
 
-W = "w"
-A = "a"
-S = "s"
-D = "d"
+# Mask to decode a single tile from the state on the Python side.
+NIBBLE_MASK = 0xF
+
+# Direction codes.
+W = 0
+A = 1
+S = 2
+D = 3
 
 
 class Board:
@@ -38,14 +56,19 @@ class Board:
         # Game state
         self.score = 0
         self.high_score = 0
-        self.board = self._init_board()
+        self.state = self._init_board()
+
+        # Drawing caches. Tile values and scores only ever change the text,
+        # so rendered surfaces are kept per tile value and per score label.
+        self._draw_items = self._init_draw_items()
+        self._text_cache: dict[int, pg.Surface] = {}
+        self._labels: dict[str, tuple[int, Label]] = {}
 
     def __str__(self) -> str:
         string = ""
         for r in range(self.size):
             for c in range(self.size):
-                tile = self.board[r, c]
-                string += str(tile) + "\t"
+                string += str(self._get_value(r, c)) + "\t"
             string += "\n"
         return string
 
@@ -56,17 +79,20 @@ class Board:
 
     def generate_tile(self) -> None:
         """Randomly generate a tile on an empty spot on the board."""
-        vfunc = np.vectorize(Tile.is_empty)
-        empty_tiles = self.board[vfunc(self.board)]
-        if len(empty_tiles) > 0:
-            empty_tile = np.random.choice(empty_tiles)
-            value = 2 if np.random.binomial(1, 0.9) else 4
-            empty_tile.set_value(value)
+        empty = empty_mask(self.state)
+        count = empty.bit_count()
+        if count > 0:
+            # Clear a random number of the lowest empty bits, take the next one.
+            for _ in range(random.randrange(count)):
+                empty &= empty - 1
+            position = (empty & -empty).bit_length() - 1
+            exponent = 1 if random.random() < 0.9 else 2
+            self.state |= exponent << position
 
     def reset(self) -> None:
         """Reset the state of the game."""
         self.score = 0
-        self.board = self._init_board()
+        self.state = self._init_board()
 
     def move(self, key) -> None:
         """Perform a move in the game."""
@@ -77,41 +103,72 @@ class Board:
                 self._move_tiles(direction=W)
             if key == pg.K_a or key == pg.K_LEFT:
                 self._move_tiles(direction=A)
-            if key == pg.K_s or key == pg.K_RIGHT:
+            if key == pg.K_s or key == pg.K_DOWN:
                 self._move_tiles(direction=S)
-            if key == pg.K_d or key == pg.K_DOWN:
+            if key == pg.K_d or key == pg.K_RIGHT:
                 self._move_tiles(direction=D)
 
-    def _init_board(self) -> np.ndarray:
+    def _init_board(self) -> int:
         """Initialize the state of the board."""
-        board = []
-        for r in range(self.size):
-            for c in range(self.size):
-                board.append(Tile(r, c))
-        return np.array(board, dtype=Tile).reshape(self.shape)
+        return EMPTY_BOARD
 
-    def _draw_tiles(self) -> None:
+    def _init_draw_items(self) -> list[tuple[int, int, pg.Rect, tuple[int, int]]]:
+        """Compute the position, rectangle and text center of every tile on the
+        screen, in the same row-major order as the nibbles of the state."""
         w, h = self.tile_size
-        for r in range(self.shape[0]):
-            for c in range(self.shape[1]):
-                # Draw tile.
-                tile = self.board[r, c]
-                tile_rect = pg.Rect(
-                    (c * w + self.border_size, r * h + self.border_size),
-                    (w - 2 * self.border_size, h - 2 * self.border_size),
-                )
-                pg.draw.rect(self.screen, tile.get_color(), tile_rect)
-
-                # Draw text on tiles.
-                tile_text = self.font.render(str(tile), True, "white")
-                tile_rect = tile_text.get_rect(center=tile_rect.center)
-                self.screen.blit(tile_text, tile_rect)
+        items = []
+        for r, c in np.ndindex(self.shape):
+            tile_rect = pg.Rect(
+                (c * w + self.border_size, r * h + self.border_size),
+                (w - 2 * self.border_size, h - 2 * self.border_size),
+            )
+            items.append((r, c, tile_rect, tile_rect.center))
+        return items
+
+    def _get_value(self, row: int, col: int) -> int:
+        """Decode the value of the tile on (row, col) from the state."""
+        exponent = (self.state >> (4 * (row * self.size + col))) & NIBBLE_MASK
+        return 1 << exponent if exponent else 0
+
+    def _get_text(self, tile: Tile) -> pg.Surface:
+        """Get the rendered text of a tile, rendering it only once per value."""
+        tile_text = self._text_cache.get(tile.val)
+        if tile_text is None:
+            tile_text = self.font.render(str(tile), True, "white")
+            self._text_cache[tile.val] = tile_text
+        return tile_text
+
+    def _get_label(self, name: str, value: int, **kwargs) -> Label:
+        """Get the label with the given name, re-rendering it only when the
+        value it shows has changed."""
+        cached = self._labels.get(name)
+        if cached is None or cached[0] != value:
+            cached = (value, Label(font=self.font, **kwargs))
+            self._labels[name] = cached
+        return cached[1]
+
+    def _draw_tiles(self) -> None:
+        screen = self.screen
+        blit = screen.blit
+        draw_rect = pg.draw.rect
+        get_text = self._get_text
+
+        state = self.state
+        for r, c, tile_rect, center in self._draw_items:
+            # Draw tile and the text on it in a single pass.
+            exponent = state & NIBBLE_MASK
+            state >>= 4
+            tile = Tile(r, c, 1 << exponent if exponent else 0)
+            draw_rect(screen, tile.get_color(), tile_rect)
+            tile_text = get_text(tile)
+            blit(tile_text, tile_text.get_rect(center=center))
 
     def _draw_score(self) -> None:
         x = 0 + self.score_size // 2
         y = self.screen.get_height() - self.score_size // 2
-        score = Label(
-            font=self.font,
+        score = self._get_label(
+            "score",
+            self.score,
             text=f"Score: {self.score}",
             color="white",
             position=(x, y),
@@ -120,8 +177,9 @@ class Board:
         score.draw(self.screen)
 
         x = self.size * self.tile_size[0] - self.score_size // 2
-        high_score = Label(
-            font=self.font,
+        high_score = self._get_label(
+            "high_score",
+            self.high_score,
             text=f"Best: {self.high_score}",
             color="white",
             position=(x, y),
@@ -129,72 +187,35 @@ class Board:
         )
         high_score.draw(self.screen)
 
-    def _in_bounds(self, row: int, col: int) -> bool:
-        return 0 <= row < self.size and 0 <= col < self.size
+    def _add_score(self, score: int) -> None:
+        self.score += score
+        if self.high_score < self.score:
+            self.high_score = self.score
+
+    def _move_tiles(self, direction: int) -> None:
+        # Moving up or down is moving left or right on the transposed board.
+        state = self.state
+        if direction in [W, S]:
+            state = transpose_u64(state)
 
-    def _get_tile(self, tile: Tile, direction: str) -> Tile:
-        other_index = tile.index_of(direction)
-        if self._in_bounds(*other_index):
-            return self.board[other_index]
-        return Tile()
+        if direction in [W, A]:
+            score = score_left_u64(state, SCORE_LEFT)
+            state = move_left_u64(state, MOVE_LEFT)
+        else:
+            score = score_right_u64(state, SCORE_LEFT)
+            state = move_right_u64(state, MOVE_LEFT)
 
-    def _is_movable(self, tile: Tile, direction: str) -> bool:
-        other_tile = self._get_tile(tile, direction)
-        if not other_tile.is_valid():
-            return False
-        return other_tile.is_empty() or other_tile == tile
+        if direction in [W, S]:
+            state = transpose_u64(state)
 
-    def _combine_tiles(self, a: Tile, b: Tile):
-        a.val, b.val = 0, a.val * 2
-        self.score += b.val
-        if self.high_score < self.score:
-            self.high_score = self.score
+        self.state = state
+        self._add_score(score)
 
-    def _swap_tiles(self, a: Tile, b: Tile):
-        a.val, b.val = b.val, a.val
-
-    def _move_tile(self, tile: Tile, direction: str) -> None:
-        if self._is_movable(tile, direction):
-            other_tile = self._get_tile(tile, direction)
-            if other_tile.is_valid() and other_tile.not_empty():
-                self._combine_tiles(tile, other_tile)
-            else:
-                self._swap_tiles(tile, other_tile)
-                self._move_tile(other_tile, direction)
-
-    def _move_tiles(self, direction: str) -> None:
-        vfunc = np.vectorize(Tile.not_empty)
-        tiles = self.board[np.where(vfunc(self.board))]
-        if direction in [S, D]:
-            tiles = np.flip(tiles)
-
-        for tile in tiles:
-            self._move_tile(tile, direction)
-
-    def _has_valid_moves(self, tile: Tile) -> bool:
-        other_tile = self._get_tile(tile, W)
-        if other_tile.is_valid() and other_tile == tile:
-            return True
-        other_tile = self._get_tile(tile, A)
-        if other_tile.is_valid() and other_tile == tile:
-            return True
-        other_tile = self._get_tile(tile, S)
-        if other_tile.is_valid() and other_tile == tile:
-            return True
-        other_tile = self._get_tile(tile, D)
-        if other_tile.is_valid() and other_tile == tile:
-            return True
-        return False
+    def _has_valid_moves(self) -> bool:
+        # A full board can only move when two neighbouring tiles can merge.
+        return has_merge(self.state)
 
     def _alive(self) -> bool:
-        vfunc = np.vectorize(Tile.is_empty)
-        empty_tiles = self.board[vfunc(self.board)]
-        if len(empty_tiles) > 0:
+        if empty_mask(self.state):
             return True
-
-        for r in range(self.size):
-            for c in range(self.size):
-                tile = self.board[r, c]
-                if self._has_valid_moves(tile):
-                    return True
-        return False
+        return self._has_valid_moves()
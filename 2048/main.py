@@ -18,14 +18,16 @@ from settings import Settings
 WIDTH, HEIGHT = 600, 650
 
 
-def get_key() -> pg.event:
-    """Get the key that is pressed down."""
-    while True:
-        event = pg.event.wait()
+def get_keys() -> list[int]:
+    """Get the keys that were pressed down since the last frame."""
+    pg.event.pump()
+    keys = []
+    for event in pg.event.get(pump=False):
         if event.type == pg.QUIT:
-            return event.type
+            keys.append(event.type)
         if event.type == pg.KEYDOWN:
-            return event.key
+            keys.append(event.key)
+    return keys
 
 
 def main() -> None:
@@ -45,20 +47,22 @@ def main() -> None:
     board.draw()
     pg.display.flip()
 
-    # Poll for events
+    # Poll for events once per frame
     while running:
-        # fill the screen with a color to wipe away anything from last frame
-        screen.fill("grey")
-
-        key = get_key()
-        if key == pg.QUIT:
-            running = False
-        board.move(key)
-        board.generate_tile()
-        board.draw()
-
-        # flip() the display to put your work on screen
-        pg.display.flip()
+        keys = get_keys()
+        if keys:
+            # fill the screen with a color to wipe away anything from last frame
+            screen.fill("grey")
+
+            for key in keys:
+                if key == pg.QUIT:
+                    running = False
+                board.move(key)
+                board.generate_tile()
+            board.draw()
+
+            # flip() the display to put your work on screen
+            pg.display.flip()
 
         clock.tick(60)  # limits FPS to 60
 
@@ -10,7 +10,6 @@ This module implements a Tile class for the 2048 game.
 """
 
 import random
-from dataclasses import dataclass
 
 from pygame import Color
 
@@ -18,16 +17,39 @@ INVALID = -1
 EMPTY = 0
 
 
-color_dict = {EMPTY: Color(255, 255, 255)}
+# Colors of the tiles. The common values have a fixed color, larger values
+# get a random color the first time they appear.
+color_dict = {
+    EMPTY: Color(255, 255, 255),
+    2: Color(148, 130, 112),
+    4: Color(128, 110, 92),
+    8: Color(242, 177, 121),
+    16: Color(245, 149, 99),
+    32: Color(246, 124, 95),
+    64: Color(246, 94, 59),
+    128: Color(224, 184, 60),
+    256: Color(214, 170, 40),
+    512: Color(204, 156, 20),
+    1024: Color(194, 142, 10),
+    2048: Color(184, 128, 0),
+    4096: Color(60, 58, 50),
+}
 
 
-@dataclass
 class Tile:
     """Class for keeping track of the number on a tile on the board."""
 
-    row: int = INVALID
-    col: int = INVALID
-    val: int = EMPTY
+    __slots__ = ("row", "col", "val")
+
+    def __init__(
+        self, row: int = INVALID, col: int = INVALID, val: int = EMPTY
+    ) -> None:
+        self.row = row
+        self.col = col
+        self.val = val
+
+    def __repr__(self) -> str:
+        return f"Tile(row={self.row}, col={self.col}, val={self.val})"
 
     def __str__(self) -> str:
         return str(self.val)
@@ -48,12 +70,13 @@ class Tile:
 
     def get_color(self) -> None:
         """Get the color of the tile."""
-        if self.val not in color_dict:
+        color = color_dict.get(self.val)
+        if color is None:
             r = random.randint(0, 255)
             g = random.randint(0, 255)
             b = random.randint(0, 255)
-            color_dict[self.val] = Color(r, g, b)
-        return color_dict[self.val]
+            color = color_dict[self.val] = Color(r, g, b)
+        return color
 
     def is_valid(self) -> bool:
         """Check if the tile is valid."""
@@ -66,26 +89,3 @@ class Tile:
     def not_empty(self) -> bool:
         """Check if the tile is not empty."""
         return not self.is_empty()
-
-    def index_of(self, direction: str) -> (int, int):
-        """Get the index of the tile neighbouring this one."""
-        if direction == "w":
-            return self._w()
-        if direction == "a":
-            return self._a()
-        if direction == "s":
-            return self._s()
-        if direction == "d":
-            return self._d()
-
-    def _w(self) -> (int, int):
-        return self.row - 1, self.col
-
-    def _a(self) -> (int, int):
-        return self.row, self.col - 1
-
-    def _s(self) -> (int, int):
-        return self.row + 1, self.col
-
-    def _d(self) -> (int, int):
-        return self.row, self.col + 1
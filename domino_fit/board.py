@@ -10,8 +10,11 @@ TODO
 """
 
 
+import random
+
 import numpy as np
 import pygame as pg
+from numba import boolean, int8, int64, njit, uint8
 
 # Colors.
 COLOR_TEXT = "#000000"
@@ -32,16 +35,92 @@ EMPTY = -1
 WALL = -2
 
 
+@njit(boolean(int8[::1], int64, uint8[::1]), cache=True)
+def _fill_board(board, size, horizontal_first):
+    """Fill every empty cell of a flattened board with dominoes.
+
+    Scans the cells in row-major order and places a domino on the first empty
+    cell, either to the right of it or below it. The order in which both
+    orientations are tried is given by `horizontal_first`. When neither fits,
+    the last domino is removed and its other orientation is tried. The
+    decisions are kept on an explicit stack instead of the call stack.
+
+    Returns True if the board could be filled, False otherwise.
+    """
+    n = size * size
+
+    # A domino always covers one light and one dark cell of a checkerboard.
+    balance = 0
+    for idx in range(n):
+        if board[idx] == EMPTY:
+            balance += 1 if ((idx // size) + (idx % size)) % 2 == 0 else -1
+    if balance != 0:
+        return False
+
+    stack_idx = np.empty(n // 2 + 1, dtype=np.int64)
+    stack_attempt = np.empty(n // 2 + 1, dtype=np.int64)
+    top = 0
+    idx = 0
+    attempt = 0
+    while True:
+        # Find the first empty cell.
+        while idx < n and board[idx] != EMPTY:
+            idx += 1
+        if idx == n:
+            return True
+
+        # Try to place a domino in the orientations that are left.
+        placed = False
+        while attempt < 2:
+            horizontal = (attempt == 0) == (horizontal_first[idx] != 0)
+            if horizontal:
+                other = idx + 1
+                fits = idx % size + 1 < size
+            else:
+                other = idx + size
+                fits = other < n
+            if fits and board[other] == EMPTY:
+                if horizontal:
+                    board[idx] = 0
+                    board[other] = 2
+                else:
+                    board[idx] = 1
+                    board[other] = 0
+                stack_idx[top] = idx
+                stack_attempt[top] = attempt
+                top += 1
+                placed = True
+                break
+            attempt += 1
+
+        if placed:
+            idx += 1
+            attempt = 0
+            continue
+
+        # Backtrack
+        if top == 0:
+            return False
+        top -= 1
+        idx = stack_idx[top]
+        attempt = stack_attempt[top]
+        horizontal = (attempt == 0) == (horizontal_first[idx] != 0)
+        board[idx] = EMPTY
+        board[idx + 1 if horizontal else idx + size] = EMPTY
+        attempt += 1
+
+
 class Board:
     """Class to keep track of the state of the board."""
 
     def __init__(self, screen: pg.Surface) -> None:
         # Game attributes.
         self.size = BOARD_SIZE
-        self.board = np.array([EMPTY] * self.size**2)
+        self.board = np.full((self.size, self.size), EMPTY, dtype=np.int8)
+        self._row_sums = np.zeros(self.size, dtype=np.int16)
+        self._col_sums = np.zeros(self.size, dtype=np.int16)
+        self._pos_buf = np.empty_like(self.board)
         self.current_tile = 1
-        self.reset()
-        self.wizardry = True
 
         # Pygame attributes.
         self.screen = screen
@@ -49,6 +128,23 @@ class Board:
         self.tile_size = (screen.get_width() - self.offset * 2) // self.size
         self.font = pg.font.SysFont(FONT, FONTSIZE)
 
+        # Text attributes. The centers of the row texts on the left and right
+        # side and of the column texts on top never change.
+        self._row_text_centers = [
+            (
+                (self.offset // 2, (i + 0.5) * self.tile_size + self.offset),
+                (
+                    screen.get_width() - self.offset // 2,
+                    (i + 0.5) * self.tile_size + self.offset,
+                ),
+            )
+            for i in range(self.size)
+        ]
+        self._col_text_centers = [
+            ((i + 0.5) * self.tile_size + self.offset, self.offset // 2)
+            for i in range(self.size)
+        ]
+
         # Sprite attributes.
         self.sprite_domino_one = pg.image.load("./sprites/domino1.png")
         self.sprite_domino_two = pg.image.load("./sprites/domino2.png")
@@ -60,135 +156,103 @@ class Board:
         self.audio_domino_remove = pg.mixer.Sound("./audio/domino_remove.mp3")
         self.audio_solved = pg.mixer.Sound("./audio/solved.mp3")
 
-    def _place_domino_horizontal(self, row: int, col: int, count: int) -> bool:
-        if self._is_valid(row, col) and self._is_valid(row, col + 1):
-            # Place the domino horizontally
-            self.board[row, col] = count
-            self.board[row, col + 1] = count
-            if self.place_domino(row, col + 2, count - 1):
-                return True
-            # Backtrack
-            self.board[row, col] = 0
-            self.board[row, col + 1] = 2
-
-    def _place_domino_vertical(self, row: int, col: int, count: int) -> bool:
-        if self._is_valid(row, col) and self._is_valid(row + 1, col):
-            # Place the domino vertically
-            self.board[row, col] = count
-            self.board[row + 1, col] = count
-            if self.place_domino(row, col + 1, count - 1):
-                return True
-            # Backtrack
-            self.board[row, col] = 1
-            self.board[row + 1, col] = 0
-
-    def place_domino(self, row: int, col: int, count: int) -> bool:
-        """Recursively place dominoes until `count` is reached
-        or when no more dominoes can be placed on the board."""
-        if count == 0:
-            return True
-
-        for i in range(row, self.size):
-            for j in range(col, self.size):
-                choice = np.random.choice(["horizontal", "vertical"])
-                if choice == "horizontal":
-                    self._place_domino_horizontal(i, j, count)
-                    self._place_domino_vertical(i, j, count)
-                else:
-                    self._place_domino_vertical(i, j, count)
-                    self._place_domino_horizontal(i, j, count)
-
-        return False
+        self.reset()
+        self.wizardry = True
 
     def toggle_tile(self) -> None:
         """Toggle between the tiles."""
         self.current_tile = 2 if self.current_tile == 1 else 1
 
     def generate_board(self) -> None:
-        """Recursively fill an empty board with dominoes until
-        there are no empty spaces left."""
+        """Fill an empty board with dominoes until there are no empty spaces
+        left. New walls are only drawn when the walls make that impossible."""
         while True:
-            if np.all(self.board != EMPTY):
-                return
-
-            self.board = np.array([EMPTY] * self.size**2)
-            wall_count = np.random.choice([5, 7])
+            self.board = np.full((self.size, self.size), EMPTY, dtype=np.int8)
+            horizontal_first = np.random.randint(
+                0, 2, size=self.size**2, dtype=np.uint8
+            )
+            wall_count = 5 if random.random() < 0.5 else 7
             wall_index = np.random.choice(self.size**2, wall_count, False)
-            self.board[wall_index] = WALL
-            self.board.shape = (self.size, self.size)
-            self.place_domino(0, 0, self.size**2 - wall_count)
+            self.board.flat[wall_index] = WALL
+            if _fill_board(self.board.ravel(), self.size, horizontal_first):
+                return
 
     def reset(self) -> None:
         """Generate a level for the game. The level consists of
         a board that is mostly empty, except for some walls."""
         self.generate_board()
-        self.rows = np.sum(np.where(self.board > 0, self.board, 0), axis=1)
-        self.cols = np.sum(np.where(self.board > 0, self.board, 0), axis=0)
+        self.rows, self.cols = self._positive_sums()
         self.board[self.board >= 0] = EMPTY
+        self._row_sums[:] = 0
+        self._col_sums[:] = 0
         self.wizardry = True
 
+        # Render the texts of this level once in every color.
+        self._row_texts = [self._render_text(value) for value in self.rows]
+        self._col_texts = [self._render_text(value) for value in self.cols]
+
+    def _positive_sums(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sum the positive cells of every row and column of the board."""
+        np.maximum(self.board, 0, out=self._pos_buf)
+        return self._pos_buf.sum(axis=1), self._pos_buf.sum(axis=0)
+
+    def _render_text(self, value: int) -> dict[str, pg.Surface]:
+        """Render the text of a value in every color it can be drawn in."""
+        return {
+            color: self.font.render(str(value), True, color)
+            for color in (COLOR_TEXT, CORRECT, WRONG)
+        }
+
     def _draw_text(self) -> None:
         """Draw the text."""
-        rows = np.sum(np.where(self.board > 0, self.board, 0), axis=1)
-        cols = np.sum(np.where(self.board > 0, self.board, 0), axis=0)
+        blit = self.screen.blit
+        rows = self._row_sums.tolist()
+        cols = self._col_sums.tolist()
+        target_rows = self.rows.tolist()
+        target_cols = self.cols.tolist()
 
         # Render row texts
-        for row in range(self.size):
+        for row, (left, right) in enumerate(self._row_text_centers):
             text_color = (
                 CORRECT
-                if rows[row] == self.rows[row]
-                else WRONG if rows[row] > self.rows[row] else COLOR_TEXT
+                if rows[row] == target_rows[row]
+                else WRONG if rows[row] > target_rows[row] else COLOR_TEXT
             )
-            text = self.font.render(str(self.rows[row]), True, text_color)
-
-            # Render row texts on left side
-            text_x = self.offset // 2
-            text_y = (row + 0.5) * self.tile_size + self.offset
-            text_rect = text.get_rect(center=(text_x, text_y))
-            self.screen.blit(text, text_rect)
+            text = self._row_texts[row][text_color]
 
-            # Render row texts on right side
-            text_x = self.screen.get_width() - self.offset // 2
-            text_rect = text.get_rect(center=(text_x, text_y))
-            self.screen.blit(text, text_rect)
+            # Render row texts on left and right side
+            blit(text, text.get_rect(center=left))
+            blit(text, text.get_rect(center=right))
 
         # Render column texts
-        for col in range(self.size):
+        for col, center in enumerate(self._col_text_centers):
             text_color = (
                 CORRECT
-                if cols[col] == self.cols[col]
-                else WRONG if cols[col] > self.cols[col] else COLOR_TEXT
+                if cols[col] == target_cols[col]
+                else WRONG if cols[col] > target_cols[col] else COLOR_TEXT
             )
-            text = self.font.render(str(self.cols[col]), True, text_color)
-
-            text_x = (col + 0.5) * self.tile_size + self.offset
-            text_y = self.offset // 2
-            text_rect = text.get_rect(center=(text_x, text_y))
-            self.screen.blit(text, text_rect)
-
-    def _draw_tile(self, row: int, col: int) -> None:
-        """Draw the a tile."""
-        rect = pg.Rect(
-            row * self.tile_size + self.offset,
-            col * self.tile_size + self.offset,
-            self.tile_size,
-            self.tile_size,
-        )
-
-        val = self.board[(col, row)]
-        if val == WALL:
-            self.screen.blit(self.sprite_wall, rect)
-        if val == 1:
-            self.screen.blit(self.sprite_domino_one, rect)
-        if val == 2:
-            rect.x -= self.tile_size
-            self.screen.blit(self.sprite_domino_two, rect)
+            text = self._col_texts[col][text_color]
+            blit(text, text.get_rect(center=center))
 
     def _draw_tiles(self) -> None:
         """Draw the board."""
-        for row in range(self.size):
-            for col in range(self.size):
-                self._draw_tile(row, col)
+        blit = self.screen.blit
+        tile_size = self.tile_size
+        offset = self.offset
+        sprite_wall = self.sprite_wall
+        sprite_domino_one = self.sprite_domino_one
+        sprite_domino_two = self.sprite_domino_two
+
+        for col, cells in enumerate(self.board.tolist()):
+            y = col * tile_size + offset
+            for row, val in enumerate(cells):
+                x = row * tile_size + offset
+                if val == WALL:
+                    blit(sprite_wall, (x, y))
+                if val == 1:
+                    blit(sprite_domino_one, (x, y))
+                if val == 2:
+                    blit(sprite_domino_two, (x - tile_size, y))
 
     def _draw_current_tile(self) -> None:
         screen_width, screen_height = self.screen.get_size()
@@ -233,6 +297,14 @@ class Board:
     def _is_valid(self, row: int, col: int) -> bool:
         return self._is_on_board(row, col) and not self._is_occupied(row, col)
 
+    def _set_cell(self, row: int, col: int, value: int) -> None:
+        """Set the cell on (row, col) and keep the row and column sums of the
+        positive cells up to date."""
+        delta = max(value, 0) - max(int(self.board[row, col]), 0)
+        self.board[row, col] = value
+        self._row_sums[row] += delta
+        self._col_sums[col] += delta
+
     def remove_tile(self, row: int, col: int) -> None:
         """Remove a tile from the board."""
         if not self._is_on_board(row, col):
@@ -240,19 +312,19 @@ class Board:
 
         cell = self.board[row, col]
         if cell == 0:
-            self.board[row, col] = EMPTY
-            if self.board[row - 1, col] == 1:
-                self.board[row - 1, col] = EMPTY
-            if self.board[row, col + 1] == 2:
-                self.board[row, col + 1] = EMPTY
+            self._set_cell(row, col, EMPTY)
+            if self._is_on_board(row - 1, col) and self.board[row - 1, col] == 1:
+                self._set_cell(row - 1, col, EMPTY)
+            if self._is_on_board(row, col + 1) and self.board[row, col + 1] == 2:
+                self._set_cell(row, col + 1, EMPTY)
             pg.mixer.Sound.play(self.audio_domino_remove)
         if cell == 1:
-            self.board[row, col] = EMPTY
-            self.board[row + 1, col] = EMPTY
+            self._set_cell(row, col, EMPTY)
+            self._set_cell(row + 1, col, EMPTY)
             pg.mixer.Sound.play(self.audio_domino_remove)
         if cell == 2:
-            self.board[row, col] = EMPTY
-            self.board[row, col - 1] = EMPTY
+            self._set_cell(row, col, EMPTY)
+            self._set_cell(row, col - 1, EMPTY)
             pg.mixer.Sound.play(self.audio_domino_remove)
 
         self.wizardry = False
@@ -264,14 +336,14 @@ class Board:
 
         # Place tile vertically.
         if self.current_tile == 1 and self._is_valid(row + 1, col):
-            self.board[row, col] = 1
-            self.board[row + 1, col] = 0
+            self._set_cell(row, col, 1)
+            self._set_cell(row + 1, col, 0)
             pg.mixer.Sound.play(self.audio_domino_place)
 
         # Place tile horizontally
         if self.current_tile == 2 and self._is_valid(row, col - 1):
-            self.board[row, col] = 2
-            self.board[row, col - 1] = 0
+            self._set_cell(row, col, 2)
+            self._set_cell(row, col - 1, 0)
             pg.mixer.Sound.play(self.audio_domino_place)
 
         if self.is_solved():
@@ -280,6 +352,6 @@ class Board:
 
     def is_solved(self) -> bool:
         """Check if the board is solved."""
-        rows = np.sum(np.where(self.board > 0, self.board, 0), axis=1)
-        cols = np.sum(np.where(self.board > 0, self.board, 0), axis=0)
-        return (cols == self.cols).all() and (rows == self.rows).all()
+        return np.array_equal(self._row_sums, self.rows) and np.array_equal(
+            self._col_sums, self.cols
+        )
@@ -10,6 +10,8 @@ TODO
 """
 
 
+import numpy as np
+
 from probability import choose, complement
 from theory import ProbabilityDistribution
 
@@ -41,12 +43,14 @@ class Bernoulli(ProbabilityDistribution):
     def __init__(self, p: float) -> None:
         self.p: float = p
         self.q: float = complement(p)
+        self._mean: float = self.p
+        self._variance: float = self.p * self.q
 
     def mean(self) -> float:
-        return self.p
+        return self._mean
 
     def variance(self) -> float:
-        return self.p * self.q
+        return self._variance
 
 
 class Binomial(ProbabilityDistribution):
@@ -77,16 +81,38 @@ class Binomial(ProbabilityDistribution):
         self.n: int = n
         self.p: float = p
         self.q: float = complement(p)
+        self._mean: float = self.n * self.p
+        self._variance: float = self.n * self.p * self.q
 
     def probability(self, k: int) -> float:
         """Probability of exactly k successes in n trials."""
         return choose(self.n, k) * self.p**k * self.q ** (self.n - k)
 
+    def pmf(self) -> np.ndarray:
+        """Probability of exactly k successes in n trials for k = 0, ..., n.
+
+        Uses the recurrence Pr(X = k + 1) = Pr(X = k) * (n - k) / (k + 1) * p / q,
+        accumulated in log-space so that large n does not underflow.
+        """
+        if self.p == 0 or self.q == 0:
+            out: np.ndarray = np.zeros(self.n + 1)
+            out[self.n if self.q == 0 else 0] = 1.0
+            return out
+
+        k: np.ndarray = np.arange(self.n)
+        log_ratio: np.ndarray = (
+            np.log(self.n - k) - np.log(k + 1) + np.log(self.p) - np.log(self.q)
+        )
+        log_pmf: np.ndarray = self.n * np.log(self.q) + np.concatenate(
+            ([0.0], np.cumsum(log_ratio))
+        )
+        return np.exp(log_pmf)
+
     def mean(self) -> float:
-        return self.n * self.p
+        return self._mean
 
     def variance(self) -> float:
-        return self.n * self.p * self.q
+        return self._variance
 
 
 class Normal(ProbabilityDistribution):
@@ -110,9 +136,11 @@ class Normal(ProbabilityDistribution):
     def __init__(self, mu: float, sigma: float) -> None:
         self.mu: float = mu
         self.sigma: float = sigma
+        self._mean: float = self.mu
+        self._variance: float = self.sigma**2
 
     def mean(self) -> float:
-        return self.mu
+        return self._mean
 
     def variance(self) -> float:
-        return self.sigma**2
+        return self._variance
@@ -9,6 +9,7 @@ Summary:
 TODO
 """
 
+from collections import defaultdict
 from enum import StrEnum, auto
 from fractions import Fraction
 from typing import Any, Callable, Optional
@@ -91,13 +92,33 @@ class CardDraw(DiscreteRandomVariable):
 
         super().__init__(values=values, weights=weights)
 
+    def _build_arrays(self) -> None:
+        """Cache the arrays and index the cards by their first (rank) and last
+        (suit) character, so the index is rebuilt along with the arrays."""
+        super()._build_arrays()
+        self._by_rank: defaultdict[str, set[str]] = defaultdict(set)
+        self._by_suit: defaultdict[str, set[str]] = defaultdict(set)
+        for v in self.values:
+            if v:
+                self._by_rank[v[0]].add(v)
+                self._by_suit[v[-1]].add(v)
+
     def _odds_events(self, events: set[str]) -> Fraction:
         """Odds of an event in the discrete random variable."""
-        filtered_events: set[str] = {
-            v
-            for v in self.values
-            if any(v == e or v.startswith(e) or v.endswith(e) for e in events)
-        }
+        self._arrays()
+        filtered_events: set[str] = set()
+        for e in events:
+            if len(e) == 1:
+                filtered_events |= self._by_rank.get(e, set())
+                filtered_events |= self._by_suit.get(e, set())
+            else:
+                filtered_events |= {
+                    v
+                    for v in self.values
+                    if v == e or v.startswith(e) or v.endswith(e)
+                }
+        if self._uniform_weight is not None:
+            return self._uniform_weight * len(filtered_events)
         return Fraction(sum(self.weights[v] for v in filtered_events))
 
     def draw(self) -> str:
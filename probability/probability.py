@@ -9,6 +9,8 @@ Summary:
 TODO
 """
 
+import math
+
 
 def complement(p: float) -> float:
     """Calculate the complement of a probability p."""
@@ -17,10 +19,7 @@ def complement(p: float) -> float:
 
 def factorial(n: int) -> int:
     """Calculate the factorial of a number n."""
-    product: int = 1
-    for i in range(1, n + 1):
-        product *= i
-    return product
+    return math.factorial(n)
 
 
 def binomial_coefficient(n: int, k: int) -> int:
@@ -29,34 +28,28 @@ def binomial_coefficient(n: int, k: int) -> int:
     In mathematics, the binomial coefficients are the positive integers that
     occur as coefficients in the binomial theorem.
     """
-    # n choose k = n choose (n - k).
-    if k > n - k:
-        return binomial_coefficient(n, n - k)
-
-    res: int = 1
-    for i in range(k):
-        res = res * (n - i)
-        res = res // (i + 1)
-    return res
+    if k < 0 or k > n:
+        return 0
+    return math.comb(n, k)
 
 
 def choose(n: int, k: int) -> int:
     """Calculate the number of ways to choose k elements from a set of n elements."""
-    return binomial_coefficient(n, k)
+    return math.comb(n, k)
 
 
 def permutation(n: int, k: int, repetition: bool = False) -> int:
     """Calculate the number of ways to choose k elements from a set of n elements."""
     if repetition:
         return n**k
-    return factorial(n) // factorial(n - k)
+    return math.perm(n, k)
 
 
 def combination(n: int, k: int, repetition: bool = False) -> int:
     """Calculate the number of ways to choose k elements from a set of n elements."""
     if repetition:
-        return choose(n + k - 1, k)
-    return choose(n, k)
+        return math.comb(n + k - 1, k)
+    return math.comb(n, k)
 
 
 def main() -> None:
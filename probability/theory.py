@@ -12,8 +12,15 @@ TODO
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from fractions import Fraction
+from itertools import product
+from math import lcm
 from random import choices
-from typing import Any, Callable, Generator, Iterable, Union
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+# Sample with an alias table once a random variable has this many values.
+ALIAS_THRESHOLD: int = 16
 
 
 @dataclass
@@ -75,11 +82,38 @@ class RandomVariable(ABC):
         """Measure of the spread of a random variable."""
 
 
+def _build_alias_table(weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Build the tables of Walker's alias method for the given weights.
+
+    Every value i is kept with probability prob[i] and replaced by alias[i]
+    otherwise, so a value can be sampled with a single uniform index.
+    """
+    n: int = len(weights)
+    scaled: list[float] = (weights * n / weights.sum()).tolist()
+    prob: np.ndarray = np.ones(n)
+    alias: np.ndarray = np.arange(n)
+    small: list[int] = [i for i, w in enumerate(scaled) if w < 1]
+    large: list[int] = [i for i, w in enumerate(scaled) if w >= 1]
+    while small and large:
+        under: int = small.pop()
+        over: int = large.pop()
+        prob[under] = scaled[under]
+        alias[under] = over
+        scaled[over] -= 1 - scaled[under]
+        (small if scaled[over] < 1 else large).append(over)
+    return prob, alias
+
+
 @dataclass
 class DiscreteRandomVariable(RandomVariable):
     """A discrete random variable is a random variable that has a finite number
     of possible outcomes or countable number of outcomes.
 
+    The values and weights are also kept as parallel arrays, so that sums over
+    the outcomes are dot products instead of dictionary lookups. The arrays are
+    rebuilt whenever the values or weights differ from the ones they were built
+    from, also when the set or dict was changed in place.
+
     Attributes:
         values (set): possible values of the discrete random variable.
         weights (dict): weights or probabilities of the values.
@@ -88,9 +122,72 @@ class DiscreteRandomVariable(RandomVariable):
     values: set[Any]
     weights: dict[Any, Fraction]
 
-    def sample(self) -> Any:
-        """Sample a value from the discrete random variable."""
-        return choices(list(self.values), weights=list(self.weights.values()))[0]
+    def __post_init__(self) -> None:
+        self._build_arrays()
+
+    def _build_arrays(self) -> None:
+        """Cache the values, their exact weights and their cumulative weights."""
+        n: int = len(self.values)
+        # Copies of the distribution to tell when the arrays are out of date.
+        self._values_key: frozenset[Any] = frozenset(self.values)
+        self._weights_key: dict[Any, Fraction] = dict(self.weights)
+        self._values_arr: np.ndarray = np.fromiter(self.values, dtype=object, count=n)
+        self._weights_arr: np.ndarray = np.fromiter(
+            (Fraction(self.weights[v]) for v in self._values_arr),
+            dtype=object,
+            count=n,
+        )
+        self._cdf: np.ndarray = np.cumsum(self._weights_arr.astype(float))
+        # Single draws are cheaper with random.choices on plain lists.
+        self._values_list: list[Any] = self._values_arr.tolist()
+        # Numeric values are also kept in a numeric array for predicates.
+        self._values_vec: Optional[np.ndarray] = None
+        if self._values_list and all(
+            isinstance(v, (int, float)) for v in self._values_list
+        ):
+            self._values_vec = np.array(self._values_list)
+        # Integer values have exact integer moments over a common denominator.
+        self._numerators: Optional[np.ndarray] = None
+        self._int_values: Optional[np.ndarray] = None
+        self._denominator: int = 1
+        if self._values_vec is not None and self._values_vec.dtype.kind in "biu":
+            weights: list[Fraction] = self._weights_arr.tolist()
+            self._denominator = lcm(*(w.denominator for w in weights))
+            bound: int = self._denominator * int(np.abs(self._values_vec).max())
+            # Fall back to Python integers when the sums could overflow.
+            dtype: type = np.int64 if bound**2 < 2**63 else object
+            self._numerators = np.array(
+                [w.numerator * self._denominator // w.denominator for w in weights],
+                dtype=dtype,
+            )
+            self._int_values = self._values_vec.astype(dtype)
+        self._cum_weights: list[float] = self._cdf.tolist()
+        # The odds of a uniform distribution only depend on the number of values.
+        self._uniform_weight: Optional[Fraction] = None
+        if n and all(w == self._weights_arr[0] for w in self._weights_arr):
+            self._uniform_weight = self._weights_arr[0]
+        # The moments are computed on first use.
+        self._mean: Optional[Fraction] = None
+        self._variance: Optional[Fraction] = None
+        # Building an alias table only pays off for many values.
+        self._alias: Optional[tuple[np.ndarray, np.ndarray]] = None
+        if len(self._values_arr) >= ALIAS_THRESHOLD:
+            self._alias = _build_alias_table(np.diff(self._cdf, prepend=0.0))
+
+    def sample(self, size: Optional[int] = None) -> Any:
+        """Sample a value from the discrete random variable. If size is given,
+        sample an array of size values instead."""
+        self._arrays()
+        if size is None:
+            return choices(self._values_list, cum_weights=self._cum_weights)[0]
+        if self._alias is None:
+            u: np.ndarray = np.random.random(size) * self._cdf[-1]
+            return self._values_arr[np.searchsorted(self._cdf, u, side="right")]
+
+        prob, alias = self._alias
+        i: np.ndarray = np.random.randint(len(prob), size=size)
+        u = np.random.random(size)
+        return self._values_arr[np.where(u < prob[i], i, alias[i])]
 
     def odds(self, *args, satisfies_all: bool = False) -> Fraction:
         """Compute the odds for an event to occur."""
@@ -104,27 +201,78 @@ class DiscreteRandomVariable(RandomVariable):
         """Compute the odds for any event in events to occur."""
         if self.values.isdisjoint(events):
             return Fraction(0)
-        return Fraction(sum(self.weights[v] for v in events))
+        self._arrays()
+        if self._uniform_weight is not None:
+            return self._uniform_weight * len(self.values & events)
+        return self._odds_mask(self._mask(events.__contains__, vectorize=False))
 
     def _odds_functions(
         self, *functions: Callable[[Any], bool], satisfies_all: bool = False
     ) -> Fraction:
         """Compute the odds for any event satisfying a function in functions to occur."""
-        func: Callable[[Iterable], bool] = all if satisfies_all else any
+        mask: np.ndarray = np.full(len(self.values), satisfies_all)
+        for f in functions:
+            if satisfies_all:
+                mask &= self._mask(f)
+            else:
+                mask |= self._mask(f)
+        return self._odds_mask(mask)
+
+    def _mask(
+        self, function: Callable[[Any], bool], vectorize: bool = True
+    ) -> np.ndarray:
+        """Evaluate a predicate on all numeric values at once. Predicates that do
+        not work on arrays, like `v == 2 or v == 3`, are applied to each value."""
+        self._arrays()
+        if vectorize and self._values_vec is not None:
+            try:
+                result: np.ndarray = np.asarray(function(self._values_vec))
+                if result.dtype == bool and result.shape == self._values_vec.shape:
+                    return result
+            except (TypeError, ValueError):
+                pass
+        return np.fromiter(
+            (bool(function(v)) for v in self._values_list),
+            dtype=bool,
+            count=len(self._values_list),
+        )
 
-        outcomes: set[Any] = {v for v in self.values if func(f(v) for f in functions)}
-        return Fraction(sum(self.weights[outcome] for outcome in outcomes))
+    def _odds_mask(self, mask: np.ndarray) -> Fraction:
+        """Compute the odds for any value selected by the mask to occur."""
+        return Fraction(self._arrays()[1][mask].sum())
+
+    def _arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the values and their exact weights as parallel arrays, rebuilt
+        when the distribution changed since they were built."""
+        if self.values != self._values_key or self.weights != self._weights_key:
+            self._build_arrays()
+        return self._values_arr, self._weights_arr
 
     def mean(self) -> Fraction:
         """Expected value of a random variable."""
-        return sum(Fraction(self.weights[v]) * v for v in self.values)
+        values, weights = self._arrays()
+        if self._mean is None:
+            if self._numerators is None:
+                self._mean = weights @ values
+            else:
+                total: int = int(self._numerators @ self._int_values)
+                self._mean = Fraction(total, self._denominator)
+        return self._mean
 
     def variance(self) -> Fraction:
         """Measure of the spread of a random variable."""
-        mean_value: Fraction = self.mean()
-        return sum(
-            Fraction(self.weights[v]) * (v - mean_value) ** 2 for v in self.values
-        )
+        values, weights = self._arrays()
+        if self._variance is None:
+            if self._numerators is None:
+                self._variance = weights @ (values - self.mean()) ** 2
+            else:
+                # D^2 Var(X) = D * sum(n v^2) - sum(n v)^2 for numerators n / D.
+                first: int = int(self._numerators @ self._int_values)
+                second: int = int(self._numerators @ self._int_values**2)
+                self._variance = Fraction(
+                    self._denominator * second - first**2, self._denominator**2
+                )
+        return self._variance
 
 
 @dataclass
@@ -132,6 +280,9 @@ class ContinuousRandomVariable(RandomVariable):
     """A continuous random variable is a random variable that has an uncountable
     number of possible outcomes.
 
+    The pdf is evaluated on the whole grid of the range at once, so it should
+    accept a NumPy array. Other functions are applied to each point instead.
+
     Attributes:
         pdf (Callable): probability density function of the continuous random variable.
     """
@@ -141,35 +292,64 @@ class ContinuousRandomVariable(RandomVariable):
     pdf: Callable[[float], float]
     dx: float = 0.01
 
+    def __post_init__(self) -> None:
+        self._grid_key: Optional[tuple[float, float, float, Callable]] = None
+
     def set_dx(self, dx: float) -> None:
         """Set the step size for the range of the continuous random variable."""
         self.dx = dx
 
-    def range(self) -> Generator[float, None, None]:
+    def range(self) -> np.ndarray:
         """Calculate the range of a continuous random variable."""
-        x: float = self.min_value
-        while x < self.max_value:
-            yield x
-            x += self.dx
+        self._grid()
+        return self._xs
+
+    def _grid(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the range and the pdf on it, rebuilt when the range or the pdf
+        changes."""
+        key: tuple[float, float, float, Callable] = (
+            self.min_value,
+            self.max_value,
+            self.dx,
+            self.pdf,
+        )
+        if self._grid_key != key:
+            self._xs: np.ndarray = np.arange(self.min_value, self.max_value, self.dx)
+            self._densities: np.ndarray = self._evaluate_pdf(self._xs)
+            self._grid_key = key
+        return self._xs, self._densities
+
+    def _evaluate_pdf(self, xs: np.ndarray) -> np.ndarray:
+        """Evaluate the pdf on all points at once, or per point if it does not
+        accept arrays."""
+        try:
+            densities: np.ndarray = np.asarray(self.pdf(xs), dtype=float)
+            if densities.shape == xs.shape:
+                return densities
+        except (TypeError, ValueError):
+            pass
+        return np.frompyfunc(self.pdf, 1, 1)(xs).astype(float)
 
     def mean(self) -> float:
         """Expected value of a random variable."""
-        return sum(x * self.pdf(x) for x in self.range())
+        xs, densities = self._grid()
+        return float((xs * densities).sum())
 
     def variance(self) -> float:
         """Measure of the spread of a random variable."""
+        xs, densities = self._grid()
         mean_value: float = self.mean()
-        return sum((x - mean_value) ** 2 * self.pdf(x) for x in self.range())
+        return float(((xs - mean_value) ** 2 * densities).sum())
 
 
 def join(
     rv1: DiscreteRandomVariable, rv2: DiscreteRandomVariable
 ) -> DiscreteRandomVariable:
     """Join two random variables into a joint random variable."""
-    values: set[tuple[Any, Any]] = {(v1, v2) for v1 in rv1.values for v2 in rv2.values}
-    pmf: dict[tuple[Any, Any], Fraction] = {
-        (v1, v2): rv1.weights[v1] * rv2.weights[v2]
-        for v1 in rv1.values
-        for v2 in rv2.values
-    }
-    return DiscreteRandomVariable(values=values, weights=pmf)
+    values1, weights1 = rv1._arrays()
+    values2, weights2 = rv2._arrays()
+    # The product iterates in the same row-major order as the outer product.
+    values: list[tuple[Any, Any]] = list(product(values1, values2))
+    weights: np.ndarray = np.multiply.outer(weights1, weights2).ravel()
+    pmf: dict[tuple[Any, Any], Fraction] = dict(zip(values, weights))
+    return DiscreteRandomVariable(values=set(values), weights=pmf)
@@ -12,8 +12,26 @@ Compute the odds of a certain event happening in a tournament bracket.
 
 from dataclasses import dataclass
 from enum import StrEnum, auto
-from math import prod
-from typing import Any, Callable, Generator, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from math import factorial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+from numba import int64, njit, types
+from numba.typed import Dict as TypedDict
 
 
 class Region(StrEnum):
@@ -26,8 +44,11 @@ class Region(StrEnum):
     OTHER = auto()
 
 
-@dataclass(frozen=True)
-class Team:
+# Small integer codes of the regions, used to index per-region tables.
+REGION_CODES: Dict[Region, int] = {region: i for i, region in enumerate(Region)}
+
+
+class Team(NamedTuple):
     """Class representing a team in League of Legends."""
 
     region: Region = Region.OTHER
@@ -83,28 +104,35 @@ FLY: Team = Team(Region.LCS, "FLY", "FlyQuest")
 DSG: Team = Team(Region.LCS, "DSG", "Disguised")
 TL: Team = Team(Region.LCS, "TL ", "Team Liquid")
 
+# Opponent of the team that is left over in a bracket with an odd number of teams.
+BYE: Team = Team()
+
 
 def choose_matchup(
-    teams: List[Team], rules: List[Callable[[Team, Team], bool]]
-) -> Generator[Tuple[List[Tuple[Team, Team]], List[Team]], None, None]:
-    """Choose a matchup from a list of teams.
+    mask: int, allowed: List[int]
+) -> Generator[Tuple[int, int, int], None, None]:
+    """Choose a matchup from the teams that are still available.
 
     Args:
-        teams (List[Team]):
-            List of teams in the bracket.
-        rules (List[Callable[[Team, Team], bool]]):
-            List of rules that all have to be satisfied.
+        mask (int):
+            Bitmask with bit i set if team i still has to be matched.
+        allowed (List[int]):
+            Bitmasks of the teams that each team may play, as returned by
+            allowed_masks().
 
     Yields:
-        out (Generator[Tuple[List[Tuple[Team, Team]], List[Team]], None, None]):
-            - A possible matchup
-            - A list with the remaining teams.
+        out (Generator[Tuple[int, int, int], None, None]):
+            - The index of the first team of a possible matchup.
+            - The index of the second team of a possible matchup.
+            - A bitmask with the remaining teams.
     """
-    team1: Team = teams[0]
-    other_teams: List[Team] = teams[1:]
-    for i, team2 in enumerate(other_teams):
-        if all(rule(team1, team2) for rule in rules):
-            yield [(team1, team2)], other_teams[:i] + other_teams[(i + 1) :]
+    team1_idx: int = (mask & -mask).bit_length() - 1
+    other_teams: int = mask ^ (1 << team1_idx)
+    m: int = other_teams & allowed[team1_idx]
+    while m:
+        b: int = m & -m
+        m ^= b
+        yield team1_idx, b.bit_length() - 1, other_teams ^ b
 
 
 def generate_brackets(
@@ -124,19 +152,229 @@ def generate_brackets(
     """
     if rules is None:
         rules = []
+    team_tuple: Tuple[Team, ...] = tuple(teams)
+    allowed: List[int] = allowed_masks(team_tuple, rules)
 
-    match len(teams):
-        case 0:  # There is no team left to match with.
+    full: int = (1 << len(team_tuple)) - 1
+    match len(team_tuple):
+        case 0:
             return
-        case 1:  # Yield the only team left over.
-            yield [(teams[0], Team())]
-        case 2:  # If the only matchup is valid, yield it.
-            if all(rule(teams[0], teams[1]) for rule in rules):
-                yield [(teams[0], teams[1])]
-        case _:  # Otherwise choose a matchup. Recursively repeat.
-            for matchup, other_teams in choose_matchup(teams, rules):
-                for other_matchup in generate_brackets(other_teams, rules):
-                    yield matchup + other_matchup
+        case 1:
+            yield [(team_tuple[0], BYE)]
+            return
+
+    # Search depth first with an explicit stack of the matchups that are left to
+    # try for every chosen matchup, instead of a chain of nested generators.
+    bracket: List[Tuple[Team, Team]] = []
+    frames: List[Iterator[Tuple[int, int, int]]] = [choose_matchup(full, allowed)]
+    while frames:
+        matchup: Optional[Tuple[int, int, int]] = next(frames[-1], None)
+        if matchup is None:  # Undo the matchup that led to this frame.
+            frames.pop()
+            if bracket:
+                bracket.pop()
+            continue
+
+        i, j, other_teams = matchup
+        bracket.append((team_tuple[i], team_tuple[j]))
+        match other_teams.bit_count():
+            case 0:  # Every team is matched.
+                yield bracket.copy()
+            case 1:  # Yield the only team left over.
+                yield bracket + [(team_tuple[other_teams.bit_length() - 1], BYE)]
+            case _:  # Choose a matchup from the remaining teams next.
+                frames.append(choose_matchup(other_teams, allowed))
+                continue
+        bracket.pop()
+
+
+# A (mask, needed) subproblem and its (satisfies, total) counts.
+COUNTS = types.UniTuple(int64, 2)
+MEMO = types.DictType(int64, COUNTS)
+# The memo key is the mask shifted left by NEEDED_BITS, with needed in the low
+# bits. The key has to fit in an int64, which limits the number of teams.
+NEEDED_BITS = 6
+MAX_TEAMS = 63 - NEEDED_BITS
+# Most forbidden matchups for which brackets are counted in closed form.
+CLOSED_FORM_MAX_PAIRS = 15
+
+
+@njit(COUNTS(int64, int64[::1], int64[:, ::1], int64, MEMO), cache=True)
+def _count(mask, allowed, events, needed, memo):
+    """Count the brackets that can form from the teams in mask without
+    generating them. The counts only depend on the remaining teams and the
+    number of events still needed, so each such subproblem is solved once.
+
+    Args:
+        mask (int):
+            Bitmask with bit i set if team i still has to be matched.
+        allowed (np.ndarray):
+            Bitmasks with bit j of entry i set if team i may play team j.
+        events (np.ndarray):
+            Matrix with events[i, j] set if team i playing team j is an event.
+            Column n marks the events of a team that is left over.
+        needed (int):
+            Number of events that still have to occur. Every event may only
+            occur once, which holds when all teams are distinct.
+        memo (Dict[int, Tuple[int, int]]):
+            Counts of the subproblems that were already solved.
+
+    Returns:
+        out (Tuple[int, int]):
+            - The number of brackets in which enough events occur.
+            - The number of brackets that satisfy the rules.
+    """
+    n = allowed.shape[0]
+    if mask == 0:
+        return int(needed <= 0), 1
+
+    team1 = 0
+    while not (mask >> team1) & 1:
+        team1 += 1
+    other_teams = mask ^ (1 << team1)
+    if other_teams == 0:  # Match the only team left over.
+        return int(needed - (events[team1, n] != 0) <= 0), 1
+
+    key = (mask << NEEDED_BITS) | needed
+    if key in memo:
+        return memo[key]
+
+    satisfies = 0
+    total = 0
+    candidates = other_teams & allowed[team1]
+    team2 = team1 + 1
+    while candidates >> team2:
+        if (candidates >> team2) & 1:
+            child = _count(
+                other_teams ^ (1 << team2),
+                allowed,
+                events,
+                max(needed - (events[team1, team2] != 0), 0),
+                memo,
+            )
+            satisfies += child[0]
+            total += child[1]
+        team2 += 1
+    memo[key] = (satisfies, total)
+    return satisfies, total
+
+
+def _new_memo() -> TypedDict:
+    """Create an empty memo for _count()."""
+    return TypedDict.empty(key_type=int64, value_type=COUNTS)
+
+
+# A (mask, met) subproblem of _count_met() and its (satisfies, total) counts.
+MET_KEY = types.UniTuple(int64, 2)
+MET_MEMO = types.DictType(MET_KEY, COUNTS)
+
+
+@njit(COUNTS(int64, int64[::1], int64[:, ::1], int64, int64, MET_MEMO), cache=True)
+def _count_met(mask, allowed, events, met, target, memo):
+    """Count the brackets that can form from the teams in mask, like _count(),
+    but keep track of which events occurred instead of how many. This is exact
+    when an event can occur more than once, which happens when a team is in the
+    bracket more than once.
+
+    Args:
+        mask (int):
+            Bitmask with bit i set if team i still has to be matched.
+        allowed (np.ndarray):
+            Bitmasks with bit j of entry i set if team i may play team j.
+        events (np.ndarray):
+            Matrix with the bit of the event of team i playing team j in
+            events[i, j], or 0 if it is no event. Column n holds the events of a
+            team that is left over.
+        met (int):
+            Bitmask of the events that occurred so far.
+        target (int):
+            Bitmask of the events that all have to occur.
+        memo (Dict[Tuple[int, int], Tuple[int, int]]):
+            Counts of the subproblems that were already solved.
+
+    Returns:
+        out (Tuple[int, int]):
+            - The number of brackets in which all events occur.
+            - The number of brackets that satisfy the rules.
+    """
+    n = allowed.shape[0]
+    if mask == 0:
+        return int(met == target), 1
+
+    team1 = 0
+    while not (mask >> team1) & 1:
+        team1 += 1
+    other_teams = mask ^ (1 << team1)
+    if other_teams == 0:  # Match the only team left over.
+        return int(met | events[team1, n] == target), 1
+
+    key = (mask, met)
+    if key in memo:
+        return memo[key]
+
+    satisfies = 0
+    total = 0
+    candidates = other_teams & allowed[team1]
+    team2 = team1 + 1
+    while candidates >> team2:
+        if (candidates >> team2) & 1:
+            child = _count_met(
+                other_teams ^ (1 << team2),
+                allowed,
+                events,
+                met | events[team1, team2],
+                target,
+                memo,
+            )
+            satisfies += child[0]
+            total += child[1]
+        team2 += 1
+    memo[key] = (satisfies, total)
+    return satisfies, total
+
+
+def _new_met_memo() -> TypedDict:
+    """Create an empty memo for _count_met()."""
+    return TypedDict.empty(key_type=MET_KEY, value_type=COUNTS)
+
+
+def _encode(
+    teams: List[Team],
+    events: List[Tuple[Team, Team]],
+    rules: List[Callable[[Team, Team], bool]],
+    distinct: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode the rules and events of a bracket over team indices.
+
+    Args:
+        teams (List[Team]):
+            List of teams in the bracket.
+        events (List[Tuple[Team, Team]]):
+            List of specific events that we want to see.
+        rules (List[Callable[[Team, Team], bool]]):
+            List of rules that all have to be satisfied.
+        distinct (bool, optional):
+            Flag to give every distinct event its own bit, which allows at most
+            63 distinct events. Defaults to False.
+
+    Returns:
+        out (Tuple[np.ndarray, np.ndarray]):
+            - The bitmasks of the opponents that each team may play.
+            - The matrix with the bit of the event of every matchup, or 0 if
+              it is no event, with an extra column for the team that is left
+              over. Every event has bit 1 unless distinct is set.
+    """
+    n: int = len(teams)
+    allowed: np.ndarray = np.array(allowed_masks(teams, rules), dtype=np.int64)
+    event_bits: Dict[FrozenSet[Team], int] = {}
+    for event in events:
+        event_bits.setdefault(frozenset(event), 1 << len(event_bits) if distinct else 1)
+    event_matrix: np.ndarray = np.zeros((n, n + 1), dtype=np.int64)
+    for i, team1 in enumerate(teams):
+        event_matrix[i, n] = event_bits.get(frozenset((team1, BYE)), 0)
+        for j in range(i + 1, n):
+            event_matrix[i, j] = event_bits.get(frozenset((team1, teams[j])), 0)
+    return allowed, event_matrix
 
 
 def diff_region(a: Team, b: Team) -> bool:
@@ -152,6 +390,17 @@ def diff_region(a: Team, b: Team) -> bool:
     return a.region != b.region
 
 
+@dataclass(frozen=True)
+class InvalidMatchup:
+    """Rule that returns True when given two teams that are not a and b."""
+
+    a: Team
+    b: Team
+
+    def __call__(self, x: Team, y: Team) -> bool:
+        return not ((x == self.a and y == self.b) or (x == self.b and y == self.a))
+
+
 def invalid_matchup(a: Team, b: Team) -> Callable[[Team, Team], bool]:
     """Create and return a function that takes two teams and returns True when
     given two teams that are not a and b.
@@ -164,7 +413,102 @@ def invalid_matchup(a: Team, b: Team) -> Callable[[Team, Team], bool]:
         out (Callable[[Team, Team], bool]):
             Function that returns True if it does not see a and b again, False otherwise.
     """
-    return lambda x, y: not ((x == a and y == b) or (x == b and y == a))
+    return InvalidMatchup(a, b)
+
+
+def compile_rules(
+    teams: Sequence[Team], rules: List[Callable[[Team, Team], bool]]
+) -> Tuple[List[int], List[Callable[[Team, Team], bool]]]:
+    """Collapse the diff_region() and invalid_matchup() rules into one bitmask
+    per team, so that they can be checked with a single AND instead of a call
+    per rule.
+
+    Args:
+        teams (Sequence[Team]):
+            Teams in the bracket.
+        rules (List[Callable[[Team, Team], bool]]):
+            List of rules that all have to be satisfied.
+
+    Returns:
+        out (Tuple[List[int], List[Callable[[Team, Team], bool]]]):
+            - Bitmasks with bit j of entry i set if teams i and j may not play.
+            - The remaining rules that still have to be called.
+    """
+    forbidden: List[int] = [0] * len(teams)
+    residual: List[Callable[[Team, Team], bool]] = []
+    # Bitmask of the indices of every team, so a matchup is two dict lookups.
+    team_masks: Dict[Team, int] = {}
+    for i, team in enumerate(teams):
+        team_masks[team] = team_masks.get(team, 0) | 1 << i
+    for rule in rules:
+        if rule is diff_region:
+            # Forbid every other team of the same region.
+            codes: List[int] = [REGION_CODES[team.region] for team in teams]
+            region_masks: List[int] = [0] * len(REGION_CODES)
+            for i, code in enumerate(codes):
+                region_masks[code] |= 1 << i
+            for i, code in enumerate(codes):
+                forbidden[i] |= region_masks[code] & ~(1 << i)
+            continue
+        if not isinstance(rule, InvalidMatchup):
+            residual.append(rule)
+            continue
+        a_mask: int = team_masks.get(rule.a, 0)
+        b_mask: int = team_masks.get(rule.b, 0)
+        for i in range(len(teams)):
+            if (a_mask >> i) & 1:
+                forbidden[i] |= b_mask & ~(1 << i)
+            if (b_mask >> i) & 1:
+                forbidden[i] |= a_mask & ~(1 << i)
+    return forbidden, residual
+
+
+def allowed_masks(
+    teams: Sequence[Team], rules: List[Callable[[Team, Team], bool]]
+) -> List[int]:
+    """Evaluate all rules for every matchup once, so that finding the possible
+    opponents of a team is a single AND with the remaining teams.
+
+    Args:
+        teams (Sequence[Team]):
+            Teams in the bracket.
+        rules (List[Callable[[Team, Team], bool]]):
+            List of rules that all have to be satisfied.
+
+    Returns:
+        List[int]: Bitmasks with bit j of entry i set if teams i and j may play.
+    """
+    n: int = len(teams)
+    forbidden: List[int]
+    forbidden, rules = compile_rules(teams, rules)
+    full: int = (1 << n) - 1
+    allowed: List[int] = [full & ~(1 << i) & ~f for i, f in enumerate(forbidden)]
+    if rules:
+        for i in range(n):
+            for j in range(i + 1, n):
+                # Rules see the teams in bracket order, lowest index first.
+                if (allowed[i] >> j) & 1 and not all(
+                    rule(teams[i], teams[j]) for rule in rules
+                ):
+                    allowed[i] &= ~(1 << j)
+                    allowed[j] &= ~(1 << i)
+    return allowed
+
+
+@lru_cache(maxsize=None)
+def odd_double_factorial(k: int) -> int:
+    """Get the double factorial (2k - 1)!! = 1 * 3 * ... * (2k - 1).
+
+    The odd numbers below 2k multiply to (2k)! / (2^k k!), as the even numbers
+    below 2k multiply to 2^k k!.
+
+    Args:
+        k (int): Number of odd numbers to multiply.
+
+    Returns:
+        int: Product of the first k odd numbers.
+    """
+    return factorial(2 * k) // (factorial(k) << k)
 
 
 def prod_odd_to(n: int) -> int:
@@ -176,7 +520,99 @@ def prod_odd_to(n: int) -> int:
     Returns:
         int: Product of all odd numbers up to n.
     """
-    return prod(i for i in range(1, n, 2))
+    # Below 1 there are no odd numbers to multiply, which is the empty product.
+    return odd_double_factorial(max(n, 0) // 2)
+
+
+def _count_matchings(mask: int, forbidden: List[Tuple[int, int]]) -> int:
+    """Count the brackets of an even number of teams that avoid the forbidden
+    matchups, by inclusion-exclusion over the sets of forbidden matchups that
+    can all occur in one bracket.
+
+    Args:
+        mask (int):
+            Bitmask with bit i set if team i has to be matched.
+        forbidden (List[Tuple[int, int]]):
+            Distinct pairs of team indices that may not play each other.
+
+    Returns:
+        int: The number of brackets without a forbidden matchup.
+    """
+    n: int = mask.bit_count()
+    pairs: List[Tuple[int, int]] = [
+        (i, j) for i, j in forbidden if (mask >> i) & 1 and (mask >> j) & 1
+    ]
+
+    def _sum(start: int, used: int, size: int) -> int:
+        """Sum the signed counts of the sets that extend the matchups in used."""
+        total: int = (-1) ** size * prod_odd_to(n - 2 * size)
+        for k in range(start, len(pairs)):
+            i, j = pairs[k]
+            if not (used >> i) & 1 and not (used >> j) & 1:
+                total += _sum(k + 1, used | 1 << i | 1 << j, size + 1)
+        return total
+
+    return _sum(0, 0, 0)
+
+
+def _forbidden_pairs(
+    teams: List[Team], rules: List[InvalidMatchup]
+) -> Set[FrozenSet[int]]:
+    """Get the distinct pairs of team indices that the invalid matchups forbid.
+
+    Args:
+        teams (List[Team]):
+            List of distinct teams in the bracket.
+        rules (List[InvalidMatchup]):
+            List of matchups that may not occur.
+
+    Returns:
+        Set[FrozenSet[int]]: The forbidden pairs between teams in the bracket.
+    """
+    index: Dict[Team, int] = {team: i for i, team in enumerate(teams)}
+    return {
+        frozenset((index[rule.a], index[rule.b]))
+        for rule in rules
+        if rule.a in index and rule.b in index and rule.a != rule.b
+    }
+
+
+def _closed_form(
+    teams: List[Team],
+    events: List[Tuple[Team, Team]],
+    forbidden_set: Set[FrozenSet[int]],
+) -> Tuple[int, int]:
+    """Count the brackets of an even number of distinct teams when all rules are
+    invalid matchups, without a search.
+
+    Args:
+        teams (List[Team]):
+            List of teams in the bracket.
+        events (List[Tuple[Team, Team]]):
+            List of specific events that all have to occur.
+        forbidden_set (Set[FrozenSet[int]]):
+            Pairs of team indices that may not play each other.
+
+    Returns:
+        out (Tuple[int, int]):
+            - The number of times all events were satisfied.
+            - The number of brackets that satisfy the rules.
+    """
+    index: Dict[Team, int] = {team: i for i, team in enumerate(teams)}
+    forbidden: List[Tuple[int, int]] = [tuple(pair) for pair in forbidden_set]
+    mask: int = (1 << len(teams)) - 1
+    total: int = _count_matchings(mask, forbidden)
+
+    # Fix the matchups of the events and count the brackets of the other teams.
+    used: int = 0
+    for event in {frozenset(event) for event in events}:
+        if len(event) != 2 or not event <= index.keys():
+            return 0, total
+        i, j = (index[team] for team in event)
+        if used & (1 << i | 1 << j) or frozenset((i, j)) in forbidden_set:
+            return 0, total
+        used |= 1 << i | 1 << j
+    return _count_matchings(mask ^ used, forbidden), total
 
 
 def bracket_has_event(
@@ -207,7 +643,8 @@ def brute_force(
     debug: bool = False,
 ) -> Tuple[int, int]:
     """Compute the odds of specific events occurring within a bracket by
-    iterating over all the possible brackets given a list of teams.
+    counting all the possible brackets given a list of teams. Brackets are only
+    generated when debug is set.
 
     Args:
         teams (List[Team]):
@@ -224,35 +661,83 @@ def brute_force(
         out (Tuple[int, int]):
             - The number of times all events were satisfied.
             - The number of brackets that satisfy the rules.
+
+    Raises:
+        ValueError: If the brackets have to be searched and there are more than
+            MAX_TEAMS teams.
     """
     if events is None:
         events = []
     if rules is None:
         rules = []
-    func: Callable[[Iterable], bool] = any if use_any else all
-
-    # Iterate over all brackets that satisfy rules.
-    total: int = 0
-    satisfies: int = 0
-    msg_str: List[str] = ["All brackets that satisfy the rules:"]
-    for bracket in generate_brackets(teams, rules):
-        total += 1
-
-        line: str = f"[{", ".join([f"{a} vs {b}" for a, b in bracket])}]"
-
-        # Check if a bracket satisfies all events.
-        if func(bracket_has_event(bracket, event) for event in events):
-            satisfies += 1
-
-            line += " <-"
-
-        msg_str.append(line)
 
     # Print all the brackets with an arrow for the ones that satisfy all events.
     if debug:
-        print("\n".join(msg_str))
-
-    return satisfies, total
+        # Give every distinct event its own bit, so the events that occur in a
+        # bracket are collected with one dict lookup per matchup.
+        event_bits: Dict[FrozenSet[Team], int] = {}
+        for event in events:
+            event_bits.setdefault(frozenset(event), 1 << len(event_bits))
+        all_events: int = (1 << len(event_bits)) - 1
+        print("All brackets that satisfy the rules:")
+        for bracket in generate_brackets(teams, rules):
+            line: str = f"[{", ".join(map("{0[0]} vs {0[1]}".format, bracket))}]"
+            met: int = 0
+            for matchup in bracket:
+                met |= event_bits.get(frozenset(matchup), 0)
+            if (met != 0) if use_any else (met == all_events):
+                line += " <-"
+            print(line)
+
+    # Count the brackets that satisfy the rules and the events.
+    n: int = len(teams)
+    if n == 0:
+        return 0, 0
+
+    # Without events, all brackets satisfy all events and none satisfy any.
+    total: int
+    if not events and not rules:
+        # Every team but a left over one is matched: (n - 1)!! brackets.
+        total = prod_odd_to(n) if n % 2 == 0 else factorial(n // 2) << (n // 2)
+        return (0 if use_any else total), total
+
+    # Invalid matchups between an even number of teams have a closed form.
+    if (
+        n % 2 == 0
+        and len(set(teams)) == n
+        and all(isinstance(rule, InvalidMatchup) for rule in rules)
+        and (not use_any or not events)
+    ):
+        forbidden: Set[FrozenSet[int]] = _forbidden_pairs(teams, rules)
+        # The closed form is exponential in the number of forbidden matchups,
+        # so the search is faster for many of them.
+        if len(forbidden) <= CLOSED_FORM_MAX_PAIRS or n > MAX_TEAMS:
+            satisfies, total = _closed_form(teams, events, forbidden)
+            return (0 if use_any else satisfies), total
+
+    if n > MAX_TEAMS:
+        raise ValueError(f"Can not count brackets of more than {MAX_TEAMS} teams.")
+
+    allowed: np.ndarray
+    event_matrix: np.ndarray
+    if not events:
+        allowed, event_matrix = _encode(teams, events, rules)
+        total = _count((1 << n) - 1, allowed, event_matrix, 0, _new_memo())[1]
+        return (0 if use_any else total), total
+
+    needed: int = 1 if use_any else len({frozenset(event) for event in events})
+    # A bracket has at most (n + 1) // 2 matchups, so more events never occur.
+    needed = min(needed, (n + 1) // 2 + 1)
+    if needed > 1 and len(set(teams)) < n and needed <= (n + 1) // 2:
+        # With duplicate teams an event can occur twice, so count which events
+        # occurred rather than how many. needed <= (n + 1) // 2 keeps the
+        # event bits within an int64.
+        allowed, event_matrix = _encode(teams, events, rules, distinct=True)
+        return _count_met(
+            (1 << n) - 1, allowed, event_matrix, 0, (1 << needed) - 1, _new_met_memo()
+        )
+    allowed, event_matrix = _encode(teams, events, rules)
+    return _count((1 << n) - 1, allowed, event_matrix, needed, _new_memo())
 
 
 def print_odds(
@@ -329,6 +814,12 @@ def test_brute_force() -> None:
     teams = [GEN, HLE, DK, FNC, BLG, FLY]
     assert brute_force(teams, events=events, rules=rules, debug=False) == (6, 6)
 
+    # More distinct events than fit in the bits of an int64.
+    teams = [T1, GEN, HLE, DK, G2, FNC, BLG, FLY, BRO, KC, AL, TL]
+    events = [(a, b) for i, a in enumerate(teams) for b in teams[i + 1 :]]
+    assert brute_force(teams, events=events, rules=rules, debug=False) == (0, 1920)
+    assert brute_force(teams, events=events, rules=rules, use_any=True) == (1920, 1920)
+
 
 def main() -> None:
     """Main function."""
@@ -46,19 +46,18 @@ class Apple(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.relocate()
 
-    def relocate(self, snake_mask: list = None):
-        """Move the apple to a new position."""
-        if not snake_mask:
-            rows = self.board.w // self.size
-            cols = self.board.h // self.size
-            snake_mask = [[1 for _ in range(rows)] for _ in range(cols)]
+    def relocate(self, free_cells: list[int] = None):
+        """Move the apple to a new position.
 
-        w = len(snake_mask)
-        h = len(snake_mask[0])
-        weight_mask = [sum(row) for row in snake_mask]
+        The cells of the board are numbered row by row, so cell i lies in
+        row i // columns and column i % columns.
+        """
+        columns = self.board.w // self.size
+        if free_cells is None:
+            rows = self.board.h // self.size
+            free_cells = range(rows * columns)
 
-        row = random.choices(range(w), weights=weight_mask).pop()
-        col = random.choices(range(h), weights=snake_mask[row]).pop()
+        cell = random.choice(free_cells)
 
-        self.rect.top = row * self.size
-        self.rect.right = col * self.size
+        self.rect.top = cell // columns * self.size
+        self.rect.left = cell % columns * self.size
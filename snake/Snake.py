@@ -10,11 +10,31 @@ Summary:
 - The snake has a method to move in a certain direction.
 - The snake can eat apples to grow in size.
 - The snake can check for self collision and halt accordingly.
+- The body of the snake is made of segments that share the image of the head.
 """
 
+from collections import deque
+
 import pygame
 
 
+class BodySegment(pygame.sprite.Sprite):
+    """A class to represent a segment of the body of a snake.
+
+    Attributes
+    ----------
+    image : pygame.Surface
+        drawing information, shared with the head of the snake.
+    rect : pygame.Rect
+        position and size of the segment.
+    """
+
+    def __init__(self, image: pygame.Surface, rect: pygame.Rect):
+        pygame.sprite.Sprite.__init__(self)
+        self.image = image
+        self.rect = rect
+
+
 class Snake(pygame.sprite.Sprite):
     """A class to represent a snake in the snake game.
 
@@ -28,37 +48,41 @@ class Snake(pygame.sprite.Sprite):
         position and size of the apple.
     board : pygame.Rect
         position and size of the board.
-    orientation : np.array
+    orientation : tuple[int, int]
         vector describing direction of sight.
+    directions : dict[int, tuple[tuple[int, int], tuple[int, int]]]
+        orientation and opposite orientation of every arrow key.
     head : bool
         bool that specifies if this is the head.
     tail : pygame.Rect
         position and size of the tail.
-    body : list[pygame.Rect]
-        list containing position and size of body.
+    body : deque[pygame.sprite.Sprite]
+        deque containing the segments of the body, from tail to head.
     length : int
         total length of the snake.
     snakes : list[pygame.sprite.Sprite]
         list containing sprites to check for collision.
+    occupancy : bytearray
+        number of snake segments on each cell of the board.
+    free_cells : list[int]
+        list containing the numbers of the cells not covered by the snake.
+    free_index : list[int]
+        position of each free cell in free_cells.
 
     Methods
     -------
     update():
         checks for key inputs and collisions.
-    mask():
-        create mask with positions of snake on board.
+    cell():
+        get the number of the board cell at a position.
+    occupy():
+        cover a cell of the board with a snake segment.
+    vacate():
+        remove a snake segment from a cell of the board.
     eat():
         eat the apple and relocate it.
     move():
         move the snake in a direction.
-    moveup():
-        change snake orientation to up.
-    movedown():
-        change snake orientation to down.
-    moveleft():
-        change snake orientation to left.
-    moveright():
-        change snake orientation to right.
     """
 
     def __init__(self, size: int, position: tuple[int, int], head: bool):
@@ -75,25 +99,34 @@ class Snake(pygame.sprite.Sprite):
 
         if head:
             self.head = head
-            self.body = [self]
+            self.body = deque([self])
             self.tail = self.rect
             self.orientation = (0, 0)
+            self.directions = {
+                pygame.K_UP: ((0, -size), (0, size)),
+                pygame.K_DOWN: ((0, size), (0, -size)),
+                pygame.K_LEFT: ((-size, 0), (size, 0)),
+                pygame.K_RIGHT: ((size, 0), (-size, 0)),
+            }
             self.length = 0
             self.snakes = pygame.sprite.Group()
 
+            cells = (self.board.h // size) * (self.board.w // size)
+            self.occupancy = bytearray(cells)
+            self.free_cells = list(range(cells))
+            self.free_index = list(range(cells))
+            self.occupy(self.cell(self.rect))
+
     def update(self, apple: pygame.sprite.Sprite):
         if not self.head:
             return
 
+        # Turn to the first pressed key that does not reverse the snake.
         key = pygame.key.get_pressed()
-        if key[pygame.K_UP]:
-            self.moveup()
-        if key[pygame.K_DOWN]:
-            self.movedown()
-        if key[pygame.K_LEFT]:
-            self.moveleft()
-        if key[pygame.K_RIGHT]:
-            self.moveright()
+        for code, (direction, opposite) in self.directions.items():
+            if key[code] and self.orientation != opposite:
+                self.orientation = direction
+                break
 
         if pygame.sprite.collide_rect(self, apple):
             self.eat(apple)
@@ -104,45 +137,40 @@ class Snake(pygame.sprite.Sprite):
 
         self.move()
 
-    def mask(self):
-        rows = self.board.w // self.size
-        cols = self.board.h // self.size
-        mask = [[1 for _ in range(rows)] for _ in range(cols)]
-        for body in self.body:
-            row = body.rect.topleft[0] // self.size
-            col = body.rect.topleft[1] // self.size
-            mask[col][row] = 0
-        return mask
+    def cell(self, rect: pygame.Rect) -> int:
+        columns = self.board.w // self.size
+        return rect.top // self.size * columns + rect.left // self.size
+
+    def occupy(self, cell: int):
+        self.occupancy[cell] += 1
+        if self.occupancy[cell] == 1:
+            # Swap the cell with the last free cell and pop it.
+            last = self.free_cells.pop()
+            if last != cell:
+                index = self.free_index[cell]
+                self.free_cells[index] = last
+                self.free_index[last] = index
+
+    def vacate(self, cell: int):
+        self.occupancy[cell] -= 1
+        if self.occupancy[cell] == 0:
+            self.free_index[cell] = len(self.free_cells)
+            self.free_cells.append(cell)
 
     def eat(self, apple: pygame.sprite.Sprite):
         self.length += 1
-        apple.relocate(self.mask())
+        apple.relocate(self.free_cells)
 
     def move(self):
         newpos = self.rect.move(self.orientation)
         if self.board.contains(newpos):
-            snake = Snake(self.size, newpos.topleft, False)
-            self.body.append(snake)
-            self.rect = snake.rect
+            segment = BodySegment(self.image, newpos)
+            self.body.append(segment)
             if self.length != len(self.body):
-                self.tail = self.body.pop(0).rect
+                self.tail = self.body.popleft().rect
+                self.vacate(self.cell(self.tail))
+            self.rect = segment.rect
+            self.occupy(self.cell(self.rect))
 
-            self.snakes.add(snake)
+            self.snakes.add(segment)
             self.snakes.remove(self.body[0])
-        pygame.event.pump()
-
-    def moveup(self):
-        if self.orientation != (0, self.size):
-            self.orientation = (0, -self.size)
-
-    def movedown(self):
-        if self.orientation != (0, -self.size):
-            self.orientation = (0, self.size)
-
-    def moveleft(self):
-        if self.orientation != (self.size, 0):
-            self.orientation = (-self.size, 0)
-
-    def moveright(self):
-        if self.orientation != (-self.size, 0):
-            self.orientation = (self.size, 0)
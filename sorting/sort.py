@@ -10,7 +10,22 @@ TODO
 """
 
 
+import bisect
+import heapq
 import random
+from typing import Callable, Optional
+
+import numpy as np
+from numba import int64, njit, void
+
+# Ranges of quick sort shorter than this are sorted with insertion sort.
+INSERTION_SORT_CUTOFF: int = 16
+# Largest value of the random arrays, and of the values that bucket sort gives
+# a bucket each.
+MAX_VALUE: int = 100
+# Range of the values that fit in the int64 arrays of the compiled kernels.
+INT64_MIN: int = -(2**63)
+INT64_MAX: int = 2**63 - 1
 
 
 def generate_random_array(size: int) -> list[int]:
@@ -19,28 +34,74 @@ def generate_random_array(size: int) -> list[int]:
     Returns:
         list[int]: random array.
     """
-    return [random.randint(1, 100) for _ in range(size)]
+    return [random.randint(1, MAX_VALUE) for _ in range(size)]
 
 
-def bubble_sort(arr: list[int]) -> list[int]:
-    """Sort an array using bubble sort.
+def _to_int64(arr: list[int], non_negative: bool = False) -> np.ndarray:
+    """Convert a list of integers to an int64 array for the compiled kernels.
+
+    Args:
+        arr (list[int]): array to convert.
+        non_negative (bool): whether the values may not be negative.
+
+    Raises:
+        TypeError: if a value is not an integer.
+        ValueError: if a value does not fit in an int64, or is negative while
+            non_negative is set.
+
+    Returns:
+        np.ndarray: the values as an int64 array.
+    """
+    if not all(
+        isinstance(num, (int, np.integer)) and not isinstance(num, bool) for num in arr
+    ):
+        raise TypeError("Can only sort lists of integers.")
+    lowest = 0 if non_negative else INT64_MIN
+    if arr and (min(arr) < lowest or max(arr) > INT64_MAX):
+        raise ValueError(f"Can only sort integers from {lowest} to {INT64_MAX}.")
+    return np.array(arr, dtype=np.int64)
+
+
+def _sort_in_place(
+    kernel: Callable[..., None],
+    arr: list[int],
+    *args: int,
+    non_negative: bool = False,
+) -> list[int]:
+    """Sort a list in place with a compiled kernel that sorts an int64 array.
 
     Args:
+        kernel (Callable[..., None]): kernel that sorts in place.
         arr (list[int]): array to sort.
+        *args (int): extra arguments for the kernel.
+        non_negative (bool): whether the kernel only sorts non-negative values.
+
+    Raises:
+        TypeError: if a value is not an integer.
+        ValueError: if a value does not fit in an int64, or is negative while
+            non_negative is set.
 
     Returns:
         list[int]: sorted array.
     """
-    n: int = len(arr)
+    arr_np: np.ndarray = _to_int64(arr, non_negative)
+    kernel(arr_np, *args)
+    arr[:] = arr_np.tolist()
+    return arr
+
+
+@njit(void(int64[::1]), cache=True)
+def _bubble_sort_nb(arr):
+    """Sort an array in place using bubble sort."""
+    n = arr.size
     for i in range(n):
         for j in range(0, n - i - 1):
             if arr[j] > arr[j + 1]:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
-    return arr
 
 
-def insertion_sort(arr: list[int]) -> list[int]:
-    """Sort an array using insertion sort.
+def bubble_sort(arr: list[int]) -> list[int]:
+    """Sort an array using bubble sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -48,19 +109,23 @@ def insertion_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    n: int = len(arr)
-    for i in range(1, n):
-        key: int = arr[i]
-        j: int = i - 1
+    return _sort_in_place(_bubble_sort_nb, arr)
+
+
+@njit(void(int64[::1]), cache=True)
+def _insertion_sort_nb(arr):
+    """Sort an array in place using insertion sort."""
+    for i in range(1, arr.size):
+        key = arr[i]
+        j = i - 1
         while j >= 0 and key < arr[j]:
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
-    return arr
 
 
-def selection_sort(arr: list[int]) -> list[int]:
-    """Sort an array using selection sort.
+def insertion_sort(arr: list[int]) -> list[int]:
+    """Sort an array using insertion sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -68,18 +133,23 @@ def selection_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    n: int = len(arr)
+    return _sort_in_place(_insertion_sort_nb, arr)
+
+
+@njit(void(int64[::1]), cache=True)
+def _selection_sort_nb(arr):
+    """Sort an array in place using selection sort."""
+    n = arr.size
     for i in range(n):
-        min_idx: int = i
+        min_idx = i
         for j in range(i + 1, n):
             if arr[j] < arr[min_idx]:
                 min_idx = j
         arr[i], arr[min_idx] = arr[min_idx], arr[i]
-    return arr
 
 
-def quick_sort(arr: list[int]) -> list[int]:
-    """Sort an array using quick sort.
+def selection_sort(arr: list[int]) -> list[int]:
+    """Sort an array using selection sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -87,36 +157,104 @@ def quick_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    if len(arr) <= 1:
-        return arr
-    pivot: int = arr[len(arr) // 2]
-    left: list[int] = [x for x in arr if x < pivot]
-    middle: list[int] = [x for x in arr if x == pivot]
-    right: list[int] = [x for x in arr if x > pivot]
-    return quick_sort(left) + middle + quick_sort(right)
-
-
-def merge_sort(arr: list[int]) -> list[int]:
-    """Sort an array using merge sort.
+    return _sort_in_place(_selection_sort_nb, arr)
+
+
+@njit(void(int64[::1], int64, int64), cache=True)
+def _quick_sort_nb(arr, lo, hi):
+    """Sort arr[lo:hi + 1] in place using quick sort. See quick_sort()."""
+    while hi - lo >= INSERTION_SORT_CUTOFF:
+        # Order the first, middle and last element to pick the median.
+        mid = (lo + hi) // 2
+        if arr[mid] < arr[lo]:
+            arr[lo], arr[mid] = arr[mid], arr[lo]
+        if arr[hi] < arr[lo]:
+            arr[lo], arr[hi] = arr[hi], arr[lo]
+        if arr[hi] < arr[mid]:
+            arr[mid], arr[hi] = arr[hi], arr[mid]
+        pivot = arr[mid]
+
+        i = lo - 1
+        j = hi + 1
+        while True:
+            i += 1
+            while arr[i] < pivot:
+                i += 1
+            j -= 1
+            while arr[j] > pivot:
+                j -= 1
+            if i >= j:
+                break
+            arr[i], arr[j] = arr[j], arr[i]
+
+        # Recurse on the smaller part and loop on the larger one, so that the
+        # recursion is at most log2(n) deep.
+        if j - lo < hi - j:
+            _quick_sort_nb(arr, lo, j)
+            lo = j + 1
+        else:
+            _quick_sort_nb(arr, j + 1, hi)
+            hi = j
+
+    if lo < hi:
+        _insertion_sort_nb(arr[lo : hi + 1])
+
+
+def quick_sort(arr: list[int], lo: int = 0, hi: Optional[int] = None) -> list[int]:
+    """Sort an array in place using quick sort with Hoare partitioning. The
+    pivot is the median of the first, middle and last element. Short ranges
+    are finished with insertion sort.
 
     Args:
         arr (list[int]): array to sort.
+        lo (int, optional): first index of the range to sort. Defaults to 0.
+        hi (Optional[int], optional): last index of the range to sort.
+            Defaults to the last index of the array.
 
     Returns:
         list[int]: sorted array.
     """
-    if len(arr) <= 1:
-        return arr
-    mid: int = len(arr) // 2
-    left: list[int] = arr[:mid]
-    right: list[int] = arr[mid:]
-    left = merge_sort(left)
-    right = merge_sort(right)
-    return list(left + right)
+    if hi is None:
+        hi = len(arr) - 1
+    return _sort_in_place(_quick_sort_nb, arr, lo, hi)
+
+
+@njit(void(int64[::1], int64[::1], int64, int64), cache=True)
+def _merge_sort_range_nb(arr, buf, lo, hi):
+    """Sort arr[lo:hi] in place using merge sort, with buf as scratch space."""
+    if hi - lo <= 1:
+        return
+    mid = (lo + hi) // 2
+    _merge_sort_range_nb(arr, buf, lo, mid)
+    _merge_sort_range_nb(arr, buf, mid, hi)
+
+    i = lo
+    j = mid
+    k = lo
+    while i < mid and j < hi:
+        if arr[j] < arr[i]:
+            buf[k] = arr[j]
+            j += 1
+        else:
+            buf[k] = arr[i]
+            i += 1
+        k += 1
+    while i < mid:
+        buf[k] = arr[i]
+        i += 1
+        k += 1
+    # What is left of the right half is already in place.
+    arr[lo:k] = buf[lo:k]
+
+
+@njit(void(int64[::1]), cache=True)
+def _merge_sort_nb(arr):
+    """Sort an array in place using merge sort."""
+    _merge_sort_range_nb(arr, np.empty_like(arr), 0, arr.size)
 
 
-def count_sort(arr: list[int]) -> list[int]:
-    """Sort an array using counting sort.
+def merge_sort(arr: list[int]) -> list[int]:
+    """Sort an array using merge sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -124,27 +262,33 @@ def count_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    max_val: int = max(arr)
-    count: list[int] = [0] * (max_val + 1)
-    output: list[int] = [0] * len(arr)
+    return _sort_in_place(_merge_sort_nb, arr)
+
+
+@njit(void(int64[::1]), cache=True)
+def _count_sort_nb(arr):
+    """Sort an array of non-negative integers in place using counting sort."""
+    if arr.size == 0:
+        return
+    count = np.zeros(arr.max() + 1, dtype=np.int64)
+    output = np.empty_like(arr)
 
     for num in arr:
         count[num] += 1
 
-    for i in range(1, len(count)):
+    for i in range(1, count.size):
         count[i] += count[i - 1]
 
-    for num in reversed(arr):
+    for i in range(arr.size - 1, -1, -1):
+        num = arr[i]
         output[count[num] - 1] = num
         count[num] -= 1
 
-    for i, _ in enumerate(arr):
-        arr[i] = output[i]
-    return arr
+    arr[:] = output
 
 
-def radix_sort(arr: list[int]) -> list[int]:
-    """Sort an array using radix sort.
+def count_sort(arr: list[int]) -> list[int]:
+    """Sort an array using counting sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -152,16 +296,46 @@ def radix_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    max1: int = max(arr)
-    exp: int = 1
+    return _sort_in_place(_count_sort_nb, arr, non_negative=True)
+
+
+@njit(void(int64[::1]), cache=True)
+def _radix_sort_nb(arr):
+    """Sort an array of non-negative integers in place using radix sort. Every
+    pass is a stable counting sort on one decimal digit, from the least
+    significant digit up."""
+    n = arr.size
+    if n == 0:
+        return
+    max1 = arr.max()
+    count = np.empty(10, dtype=np.int64)
+    src = arr
+    dst = np.empty_like(arr)
+    passes = 0
+    exp = 1
     while max1 // exp > 0:
-        count_sort(arr)
+        count[:] = 0
+        for i in range(n):
+            count[(src[i] // exp) % 10] += 1
+        for d in range(1, 10):
+            count[d] += count[d - 1]
+        for i in range(n - 1, -1, -1):
+            d = (src[i] // exp) % 10
+            count[d] -= 1
+            dst[count[d]] = src[i]
+        # The output of this pass is the input of the next one.
+        src, dst = dst, src
+        passes += 1
+        # Stop before the next power of ten overflows an int64.
+        if exp > max1 // 10:
+            break
         exp *= 10
-    return arr
+    if passes % 2:
+        arr[:] = src
 
 
-def bucket_sort(arr: list[int]) -> list[int]:
-    """Sort an array using bucket sort.
+def radix_sort(arr: list[int]) -> list[int]:
+    """Sort an array using radix sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -169,25 +343,54 @@ def bucket_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    max_val: int = max(arr)
-    size: int = len(arr)
-
-    buckets: list[list] = [[] for _ in range(size)]
+    return _sort_in_place(_radix_sort_nb, arr, non_negative=True)
+
+
+@njit(int64[::1](int64[::1]), cache=True)
+def _bucket_sort_nb(arr):
+    """Sort an array of non-negative integers using bucket sort. The buckets are
+    consecutive slices of the output, so no lists have to be allocated."""
+    size = arr.size
+    if size == 0:
+        return arr.copy()
+    max_val = arr.max()
+
+    # Small values get a bucket each, so only the bucket sizes are needed.
+    if max_val <= MAX_VALUE:
+        count = np.zeros(MAX_VALUE + 1, dtype=np.int64)
+        for num in arr:
+            count[num] += 1
+        result = np.empty_like(arr)
+        k = 0
+        for num in range(MAX_VALUE + 1):
+            result[k : k + count[num]] = num
+            k += count[num]
+        return result
+
+    index = np.empty(size, dtype=np.int64)
+    start = np.zeros(size + 1, dtype=np.int64)
+    # The width is computed in floats, as arr[i] * size can overflow an int64.
+    width = max_val / size + 1.0
     for i in range(size):
-        index = int(arr[i] * size / (max_val + 1))
-        buckets[index].append(arr[i])
-
+        index[i] = min(int(arr[i] / width), size - 1)
+        start[index[i] + 1] += 1
     for i in range(size):
-        buckets[i].sort()
+        start[i + 1] += start[i]
 
-    result: list = []
+    result = np.empty_like(arr)
+    end = start[:-1].copy()
     for i in range(size):
-        result.extend(buckets[i])
+        result[end[index[i]]] = arr[i]
+        end[index[i]] += 1
+
+    # Sort every bucket with insertion sort.
+    for b in range(size):
+        _insertion_sort_nb(result[start[b] : start[b + 1]])
     return result
 
 
-def heap_sort(arr: list[int]) -> list[int]:
-    """Sort an array using heap sort.
+def bucket_sort(arr: list[int]) -> list[int]:
+    """Sort an array using bucket sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -195,30 +398,39 @@ def heap_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
+    return _bucket_sort_nb(_to_int64(arr, non_negative=True)).tolist()
 
-    def heapify(arr: list[int], n: int, i: int) -> None:
-        largest: int = i
-        l: int = 2 * i + 1
-        r: int = 2 * i + 2
+
+@njit(void(int64[::1], int64, int64), cache=True)
+def _sift_down_nb(arr, n, i):
+    """Move arr[i] down the max heap in the first n entries of an array."""
+    while True:
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
         if l < n and arr[i] < arr[l]:
             largest = l
         if r < n and arr[largest] < arr[r]:
             largest = r
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i]
-            heapify(arr, n, largest)
+        if largest == i:
+            return
+        arr[i], arr[largest] = arr[largest], arr[i]
+        i = largest
+
 
-    n: int = len(arr)
+@njit(void(int64[::1]), cache=True)
+def _heap_sort_nb(arr):
+    """Sort an array in place using heap sort."""
+    n = arr.size
     for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
+        _sift_down_nb(arr, n, i)
     for i in range(n - 1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i]
-        heapify(arr, i, 0)
-    return arr
+        _sift_down_nb(arr, i, 0)
 
 
-def shell_sort(arr: list[int]) -> list[int]:
-    """Sort an array using shell sort.
+def heap_sort(arr: list[int]) -> list[int]:
+    """Sort an array using heap sort.
 
     Args:
         arr (list[int]): array to sort.
@@ -226,17 +438,79 @@ def shell_sort(arr: list[int]) -> list[int]:
     Returns:
         list[int]: sorted array.
     """
-    n: int = len(arr)
-    gap: int = n // 2
+    return _sort_in_place(_heap_sort_nb, arr)
+
+
+@njit(void(int64[::1]), cache=True)
+def _shell_sort_nb(arr):
+    """Sort an array in place using shell sort."""
+    n = arr.size
+    gap = n // 2
     while gap > 0:
         for i in range(gap, n):
-            temp: int = arr[i]
-            j: int = i
+            temp = arr[i]
+            j = i
             while j >= gap and arr[j - gap] > temp:
                 arr[j] = arr[j - gap]
                 j -= gap
             arr[j] = temp
         gap //= 2
+
+
+def shell_sort(arr: list[int]) -> list[int]:
+    """Sort an array using shell sort.
+
+    Args:
+        arr (list[int]): array to sort.
+
+    Returns:
+        list[int]: sorted array.
+    """
+    return _sort_in_place(_shell_sort_nb, arr)
+
+
+def timsort(arr: list[int]) -> list[int]:
+    """Sort an array using the built-in timsort of list.sort().
+
+    Args:
+        arr (list[int]): array to sort.
+
+    Returns:
+        list[int]: sorted array.
+    """
+    arr.sort()
+    return arr
+
+
+def heapq_sort(arr: list[int]) -> list[int]:
+    """Sort an array using heap sort on the built-in heapq module.
+
+    Args:
+        arr (list[int]): array to sort.
+
+    Returns:
+        list[int]: sorted array.
+    """
+    heap: list[int] = list(arr)
+    heapq.heapify(heap)
+    arr[:] = [heapq.heappop(heap) for _ in range(len(heap))]
+    return arr
+
+
+def bisect_insertion_sort(arr: list[int]) -> list[int]:
+    """Sort an array using insertion sort, finding the position of every key
+    with a binary search of the built-in bisect module.
+
+    Args:
+        arr (list[int]): array to sort.
+
+    Returns:
+        list[int]: sorted array.
+    """
+    output: list[int] = []
+    for num in arr:
+        bisect.insort(output, num)
+    arr[:] = output
     return arr
 
 
@@ -254,6 +528,9 @@ def main() -> None:
     print(f"Selection sort: {selection_sort(arr)}")
     print(f"Shell sort:     {shell_sort(arr)}")
     print(f"Quick sort:     {quick_sort(arr)}")
+    print(f"Timsort:        {timsort(arr)}")
+    print(f"Heapq sort:     {heapq_sort(arr)}")
+    print(f"Bisect sort:    {bisect_insertion_sort(arr)}")
 
 
 if __name__ == "__main__":
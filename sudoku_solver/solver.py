@@ -10,8 +10,19 @@ TODO
 """
 
 
+from typing import Iterable
+
+import numpy as np
+from numba import boolean, int64, njit
+
 SQUARE_SIZE: int = 3
 SUDOKU_SIZE: int = SQUARE_SIZE**2
+# Bitmask with a bit set for every number that can be placed.
+ALL_NUMBERS: int = (1 << SUDOKU_SIZE) - 1
+# Number of bits set in every bitmask of numbers.
+POPCOUNT: np.ndarray = np.array(
+    [mask.bit_count() for mask in range(ALL_NUMBERS + 1)], dtype=np.int64
+)
 
 
 test_sudoku: list[list[int]] = [
@@ -38,6 +49,22 @@ def print_sudoku(sudoku: list[list[int]]) -> None:
     print()
 
 
+def number_mask(numbers: Iterable[int]) -> int:
+    """Get the bitmask of a group of numbers, with bit num - 1 set for every
+    number num in the group. Empty cells set no bit.
+
+    Args:
+        numbers (Iterable[int]): numbers in a row, col or square.
+
+    Returns:
+        int: bitmask of the numbers.
+    """
+    mask: int = 0
+    for num in numbers:
+        mask |= (1 << num) >> 1
+    return mask
+
+
 def check_row(sudoku: list[list[int]], row: int) -> bool:
     """Check if a row in a sudoku is valid.
 
@@ -48,7 +75,7 @@ def check_row(sudoku: list[list[int]], row: int) -> bool:
     Returns:
         bool: True if row is valid, False otherwise.
     """
-    return sorted(sudoku[row]) == list(range(1, SUDOKU_SIZE + 1))
+    return number_mask(sudoku[row]) == ALL_NUMBERS
 
 
 def check_col(sudoku: list[list[int]], col: int) -> bool:
@@ -61,7 +88,7 @@ def check_col(sudoku: list[list[int]], col: int) -> bool:
     Returns:
         bool: True if col is valid, False otherwise.
     """
-    return sorted(sudoku[col]) == list(range(1, SUDOKU_SIZE + 1))
+    return number_mask(sudoku[row][col] for row in range(SUDOKU_SIZE)) == ALL_NUMBERS
 
 
 def check_square(sudoku: list[list[int]], row: int, col: int) -> bool:
@@ -75,11 +102,10 @@ def check_square(sudoku: list[list[int]], row: int, col: int) -> bool:
     Returns:
         bool: True if square is valid, False otherwise.
     """
-    square: list = []
+    mask: int = 0
     for i in range(SQUARE_SIZE):
-        for j in range(SQUARE_SIZE):
-            square.append(sudoku[row + i][col + j])
-    return sorted(square) == list(range(1, SUDOKU_SIZE + 1))
+        mask |= number_mask(sudoku[row + i][col : col + SQUARE_SIZE])
+    return mask == ALL_NUMBERS
 
 
 def check_sudoku(sudoku: list[list[int]]) -> bool:
@@ -121,116 +147,116 @@ def empty_cells(sudoku: list[list[int]]) -> list[tuple[int, int]]:
     ]
 
 
-def valid_in_row(sudoku: list[list[int]], row: int, num: int) -> bool:
-    """Check if a number is valid in a row.
-
-    Args:
-        sudoku (list[list[int]]): sudoku board.
-        row (int): row to check.
-        num (int): number to check.
-
-    Returns:
-        bool: True if number is valid, False otherwise.
-    """
-    return num not in sudoku[row]
-
-
-def valid_in_col(sudoku: list[list[int]], col: int, num: int) -> bool:
-    """Check if a number is valid in a col.
-
-    Args:
-        sudoku (list[list[int]]): sudoku board.
-        col (int): col to check.
-        num (int): number to check.
-
-    Returns:
-        bool: True if number is valid, False otherwise.
-    """
-    return num not in [sudoku[row][col] for row in range(SUDOKU_SIZE)]
-
-
-def valid_in_square(sudoku: list[list[int]], row: int, col: int, num: int) -> bool:
-    """Check if a number is valid in a square.
+@njit(int64(int64, int64), cache=True)
+def box_index(row: int, col: int) -> int:
+    """Find the index of the square that contains a cell, counting the squares
+    row by row.
 
     Args:
-        sudoku (list[list[int]]): sudoku board.
-        row (int): row of square.
-        col (int): col of square.
-        num (int): number to check.
-
-    Returns:
-        bool: True if number is valid, False otherwise.
-    """
-    for i in range(SQUARE_SIZE):
-        for j in range(SQUARE_SIZE):
-            if sudoku[row + i][col + j] == num:
-                return False
-    return True
-
-
-def valid_moves(sudoku: list[list[int]], row: int, col: int) -> list[int]:
-    """Find valid moves for a cell in a sudoku.
-
-    Args:
-        sudoku (list[list[int]]): sudoku board.
         row (int): row of cell.
         col (int): col of cell.
 
     Returns:
-        list[int]: list of valid moves.
+        int: index of the square.
     """
-    return [
-        num
-        for num in range(1, SUDOKU_SIZE + 1)
-        if valid_in_row(sudoku, row, num)
-        and valid_in_col(sudoku, col, num)
-        and valid_in_square(
-            sudoku, row - row % SQUARE_SIZE, col - col % SQUARE_SIZE, num
-        )
-    ]
-
-
-def try_move(sudoku: list[list[int]], row: int, col: int, num: int) -> None:
-    """Try to make a move in a sudoku.
-
-    Args:
-        sudoku (list[list[int]]): sudoku board.
-        row (int): row of cell.
-        col (int): col of cell.
-        num (int): number to place.
-    """
-    if (
-        valid_in_row(sudoku, row, num)
-        and valid_in_col(sudoku, col, num)
-        and valid_in_square(
-            sudoku, row - row % SQUARE_SIZE, col - col % SQUARE_SIZE, num
-        )
-    ):
-        sudoku[row][col] = num
+    return row // SQUARE_SIZE * SQUARE_SIZE + col // SQUARE_SIZE
+
+
+@njit(boolean(int64[::1]), cache=True)
+def _solve_nb(board):
+    """Solve a sudoku board, flattened row by row, in place. See solve_sudoku()."""
+    row_mask = np.zeros(SUDOKU_SIZE, dtype=np.int64)
+    col_mask = np.zeros(SUDOKU_SIZE, dtype=np.int64)
+    box_mask = np.zeros(SUDOKU_SIZE, dtype=np.int64)
+    empty = np.zeros(board.size, dtype=np.bool_)
+    empty_count = 0
+    for cell in range(board.size):
+        row = cell // SUDOKU_SIZE
+        col = cell % SUDOKU_SIZE
+        if board[cell]:
+            bit = 1 << (board[cell] - 1)
+            row_mask[row] |= bit
+            col_mask[col] |= bit
+            box_mask[box_index(row, col)] |= bit
+        else:
+            empty[cell] = True
+            empty_count += 1
+
+    # Search depth first with a stack of the filled in cells and the moves
+    # that are left to try for each of them.
+    stack_cell = np.empty(board.size, dtype=np.int64)
+    stack_moves = np.empty(board.size, dtype=np.int64)
+    top = 0
+    while empty_count:
+        # Find the empty cell with the fewest valid moves.
+        best = 0
+        moves = 0
+        fewest = SUDOKU_SIZE + 1
+        for cell in range(board.size):
+            if empty[cell]:
+                row = cell // SUDOKU_SIZE
+                col = cell % SUDOKU_SIZE
+                free = row_mask[row] | col_mask[col] | box_mask[box_index(row, col)]
+                free = ~free & ALL_NUMBERS
+                if POPCOUNT[free] < fewest:
+                    best, moves, fewest = cell, free, POPCOUNT[free]
+                    if fewest <= 1:
+                        break
+        empty[best] = False
+        empty_count -= 1
+        stack_cell[top] = best
+        stack_moves[top] = moves
+        top += 1
+
+        # Try the next move of the top cell, backtracking while no moves are left.
+        while top:
+            cell = stack_cell[top - 1]
+            moves = stack_moves[top - 1]
+            row = cell // SUDOKU_SIZE
+            col = cell % SUDOKU_SIZE
+            box = box_index(row, col)
+            if board[cell]:  # Undo the previous move.
+                bit = 1 << (board[cell] - 1)
+                row_mask[row] ^= bit
+                col_mask[col] ^= bit
+                box_mask[box] ^= bit
+            if moves:
+                bit = moves & -moves
+                stack_moves[top - 1] = moves ^ bit
+                # The bits below bit count up to the number it stands for.
+                board[cell] = POPCOUNT[bit - 1] + 1
+                row_mask[row] ^= bit
+                col_mask[col] ^= bit
+                box_mask[box] ^= bit
+                break
+            board[cell] = 0
+            empty[cell] = True
+            empty_count += 1
+            top -= 1
+        if top == 0:
+            return False
+    return True
 
 
 def solve_sudoku(sudoku: list[list[int]]) -> bool:
     """Solve a sudoku.
 
+    The numbers used in every row, col and square are kept as bitmasks, with
+    bit num - 1 set if num is used, so the valid moves for a cell are the bits
+    that are not set in any of its three masks. The empty cell with the fewest
+    valid moves is filled in first.
+
     Args:
         sudoku (list[list[int]]): sudoku board.
 
     Returns:
         bool: True if sudoku is solved, False otherwise.
     """
-    cells: list[tuple[int, int]] = empty_cells(sudoku)
-    if not cells:
-        return True
-
-    row: int
-    col: int
-    row, col = cells[0]
-    for num in valid_moves(sudoku, row, col):
-        try_move(sudoku, row, col, num)
-        if solve_sudoku(sudoku):
-            return True
-        sudoku[row][col] = 0
-    return False
+    board: np.ndarray = np.array(sudoku, dtype=np.int64).ravel()
+    solved: bool = _solve_nb(board)
+    for row, values in zip(sudoku, board.reshape(SUDOKU_SIZE, -1).tolist()):
+        row[:] = values
+    return solved
 
 
 def main() -> None: